@@ -0,0 +1,50 @@
+"""Compares ways of turning keys into ckeys.
+
+Run with `python -m benchmarks.canonicalize [number of keys]` from the repository root."""
+import sys
+from string import ascii_lowercase, digits
+from timeit import timeit
+
+from ss13_tools.byond import canonicalize, canonicalize_many
+
+# A round has a few hundred players, and logs mention the same ones over and over
+PLAYERS = 300
+KEYS = ["Cool Guy {n}", "some_key{n}", "@Admin-Name {n}[DC]", "ÜnicodeKëy{n}"]
+
+
+def canonicalize_comprehension(key: str) -> str:
+    """The list comprehension canonicalize used before"""
+    return ''.join([letter for letter in key.lower() if letter in ascii_lowercase + digits + '@'])
+
+
+def generate_keys(count: int, distinct: int) -> list[str]:
+    """Returns `count` keys, cycling through `distinct` different ones"""
+    return [KEYS[n % len(KEYS)].format(n=n % distinct) for n in range(count)]
+
+
+def report(name: str, seconds: float, count: int) -> None:
+    """Prints how long one key took"""
+    print(f"{name:<40}{seconds / count * 1e9:>8.0f} ns per key")
+
+
+def measure_keys(keys: list[str]) -> None:
+    """Canonicalizes `keys` with each method and prints the time per key"""
+    count = len(keys)
+    uncached = canonicalize.__wrapped__
+    report("list comprehension", timeit(lambda: [canonicalize_comprehension(key) for key in keys], number=1), count)
+    report("translate", timeit(lambda: [uncached(key) for key in keys], number=1), count)
+    canonicalize.cache_clear()
+    report("canonicalize (translate + cache)", timeit(lambda: [canonicalize(key) for key in keys], number=1), count)
+    report("canonicalize_many", timeit(lambda: canonicalize_many(keys), number=1), count)
+
+
+def measure(count: int) -> None:
+    """Measures both keys that repeat, like in logs, and keys that don't, like a list of bans"""
+    print(f"{count} repeating keys:")
+    measure_keys(generate_keys(count, PLAYERS))
+    print(f"{count} unique keys:")
+    measure_keys(generate_keys(count, count))
+
+
+if __name__ == "__main__":
+    measure(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
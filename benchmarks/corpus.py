@@ -0,0 +1,178 @@
+"""Generates made up, but realistic, tg logs. Real logs can't be shared, these can.
+
+Every log type LogBuddy parses shows up, along with TGUI lines, JSON (schema) lines and entries
+that span multiple lines. Lines are mixed in about the same proportions as in a real round.
+
+Run with `python -m benchmarks.corpus <output file> [number of lines]` from the repository root."""
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Iterator
+
+# A round has a few hundred players, and logs mention the same ones over and over
+PLAYERS = 300
+FIRST_NAMES = ["John", "Jane", "Alex", "Sam", "Chris", "Pat", "Morgan", "Robin", "Taylor", "Jordan"]
+LAST_NAMES = ["Smith", "Doe", "Miller", "Garcia", "Nguyen", "Brown", "Ivanova", "Kowalski", "Okafor", "Silva"]
+AREAS = ["Bar", "Medbay Central", "Pharmacy", "Primary Tool Storage", "Toxins Lab", "Arrivals Shuttle", "Bridge",
+         "Central Primary Hallway", "Engineering", "Security Office"]
+ITEMS = ["toolbox", "fire extinguisher", "energy sword", "stun baton", "fireaxe", "crowbar", "syringe"]
+WORDS = ["hello", "help", "security", "captain", "where", "is", "the", "clown", "grief", "me", "now", "please",
+         "medbay", "shuttle", "call", "who", "did", "this", "cargo", "botany", "ai", "open", "door"]
+CHANNELS = ["Common", "Security", "Engineering", "Medical", "Science", "Supply", "Command"]
+
+# (weight, template). {p} and {q} are players, {admin} an admin, {loc} is " (Area (x,y,z))",
+# {at} is " at Area (x,y,z)", {text} a few words, {n} a small number
+OLD_TEMPLATES = [
+    (20, 'SAY: {p} "{text}"{loc}'),
+    (6, 'GAME-SAY: {p} "{text}"{loc}'),
+    (4, 'WHISPER: {p} "{text}"{loc}'),
+    (4, 'EMOTE: {p} {text}.{loc}'),
+    (2, 'RADIOEMOTE: {p} {text}.{loc}'),
+    (5, 'OOC: {p} "{text}"{loc}'),
+    (12, 'ATTACK: {p} has attacked {q} with the {item} (NEWHP: {hp}) (COMBAT MODE: {combat}) '
+         '(DAMTYPE: BRUTE){loc}'),
+    (4, 'ATTACK: {p} has shot {q} with the {item} (NEWHP: {hp}){loc}'),
+    (2, 'ATTACK: {p} has grabbed {q} passively{loc}'),
+    (8, 'GAME: {p} has primed a {item} for detonation{at}'),
+    (4, 'GAME: {p} has opened the {item}{at}'),
+    (3, 'ACCESS: Login: {p} from 10.0.{n}.{m}-{cid} || BYOND v514'),
+    (2, 'ACCESS: Logout: {p}'),
+    (2, 'ADMIN: {admin} jumped to {area} ({x},{y},{z})'),
+    (1, 'ADMIN: Announce: {admin} : {text}'),
+    (1, 'ADMIN: {admin} healed / Revived {q}'),
+    (2, 'ADMINPRIVATE: ASAY: {admin} "{text}"{loc}'),
+    (2, 'ADMINPRIVATE: Ticket #{n}: {p}: {text}'),
+    (1, 'ADMINPRIVATE: PM: {p}->{admin}: {text}'),
+    (4, 'PDA: {p} (PDA: {name}\'s PDA) to {other_name} (Assistant) "{text}"{loc}'),
+    (2, 'SILICON: CYBORG: {p} changed their module to Engineering'),
+    (1, 'SILICON: LAW: {p} used the law board on {q} to upload law'),
+    (6, 'TCOMMS: {p} [{channel}] (spans: ) "{text}" (language: Galactic Common){loc}'),
+    (1, 'VIRUS: {p} was infected by virus: Cold sym:Sneezing{at}'),
+    (1, 'UPLINK: {p} purchased an emag for {n} telecrystals from uplink'),
+    (1, 'SHUTTLE: {p} has called the shuttle.'),
+    (1, 'MECHA: {p} entered the Ripley{at}'),
+    (1, 'PAPER: {p} wrote on paper: {text}'),
+    (1, 'TOPIC: "?ping" from: 10.0.{n}.{m}, master: , key:'),
+]
+# Logs with no category at all
+TGUI_WEIGHT = 3
+TGUI_TEMPLATE = '{ckey} (as {name} at {x},{y},{z}) in /datum/tgui_window'
+# JSON (schema) logs, they carry the same messages
+JSON_WEIGHT = 5
+JSON_CATEGORIES = [('game-say', '{p} "{text}"{loc}'),
+                   ('attack', '{p} has attacked {q} with the {item} (NEWHP: {hp}){loc}'),
+                   ('game-ooc', '{p} "{text}"{loc}')]
+# Entries spanning multiple lines, continued with lines starting with "- "
+VOTE_WEIGHT = 1
+ANNOUNCEMENT_WEIGHT = 1
+MAX_CONTINUATION_LINES = 4
+
+
+class CorpusGenerator:
+    """Makes up log lines.
+
+    Parameters:
+    `seed` (int): the same seed always makes the same lines
+    `players` (int): how many different players there are
+
+    Examples:
+    `CorpusGenerator().lines(1000)` # At least 1000 lines
+    """
+
+    def __init__(self, seed: int = 0, players: int = PLAYERS) -> None:
+        self.random = random.Random(seed)
+        self.time = datetime(2023, 3, 1, 12)
+        self.players = [self.__make_player(n) for n in range(players)]
+        self.admins = self.players[:max(players // 30, 1)]
+        self.counter = 0
+        weights = [weight for weight, _ in OLD_TEMPLATES] + \
+            [TGUI_WEIGHT, JSON_WEIGHT, VOTE_WEIGHT, ANNOUNCEMENT_WEIGHT]
+        kinds = [template for _, template in OLD_TEMPLATES] + \
+            [self.__tgui, self.__json, self.__vote, self.__announcement]
+        self.kinds, self.weights = kinds, weights
+
+    def __make_player(self, n: int) -> tuple[str, str]:
+        first, last = self.random.choice(FIRST_NAMES), self.random.choice(LAST_NAMES)
+        return f"{first.lower()}{last.lower()}{n}", f"{first} {last}"
+
+    def lines(self, count: int) -> Iterator[str]:
+        """Yields about `count` lines (multi-line entries are never cut off, so there can be a few more)"""
+        produced = 0
+        while produced < count:
+            kind = self.random.choices(self.kinds, self.weights)[0]
+            self.time += timedelta(milliseconds=self.random.randint(0, 80))
+            entry = self.__old(kind) if isinstance(kind, str) else kind()
+            produced += len(entry)
+            yield from entry
+
+    def write(self, filename: str, count: int) -> None:
+        """Writes about `count` lines to `filename`"""
+        with open(filename, "w", encoding="utf-8") as file:
+            for line in self.lines(count):
+                file.write(line)
+                file.write("\n")
+
+    def __fields(self) -> dict:
+        (ckey, name), (other_ckey, other_name) = self.random.sample(self.players, 2)
+        admin_ckey, admin_name = self.random.choice(self.admins)
+        area = self.random.choice(AREAS)
+        x, y, z = self.random.randint(1, 255), self.random.randint(1, 255), self.random.randint(2, 4)
+        self.counter += 1
+        return {
+            "p": f"{ckey}/({name})", "q": f"{other_ckey}/({other_name})", "admin": f"{admin_ckey}/({admin_name})",
+            "ckey": ckey, "name": name, "other_name": other_name, "area": area, "x": x, "y": y, "z": z,
+            "loc": f" ({area} ({x},{y},{z}))", "at": f" at {area} ({x},{y},{z})", "text": self.__text(),
+            "item": self.random.choice(ITEMS), "channel": self.random.choice(CHANNELS),
+            "hp": self.random.randint(-100, 100), "combat": self.random.randint(0, 1),
+            "n": self.counter % 250, "m": self.counter // 250 % 250, "cid": self.random.randint(10 ** 9, 10 ** 10),
+        }
+
+    def __text(self) -> str:
+        return " ".join(self.random.choices(WORDS, k=self.random.randint(1, 12)))
+
+    def __timestamp(self, separator: str = " ") -> str:
+        return self.time.isoformat(separator, "milliseconds")
+
+    def __old(self, template: str) -> list[str]:
+        return [f"[{self.__timestamp()}] " + template.format(**self.__fields())]
+
+    def __tgui(self) -> list[str]:
+        return [f"[{self.__timestamp()}] " + TGUI_TEMPLATE.format(**self.__fields())]
+
+    def __json(self) -> list[str]:
+        category, template = self.random.choice(JSON_CATEGORIES)
+        log = {"s-ver": "1.0.0", "ts": self.__timestamp("T"), "cat": category,
+               "msg": template.format(**self.__fields())}
+        return [json.dumps(log)]
+
+    def __vote(self) -> list[str]:
+        fields = self.__fields()
+        lines = [f"[{self.__timestamp()}] VOTE: {fields['ckey']} started a vote for map"]
+        for area in self.random.sample(AREAS, self.random.randint(2, MAX_CONTINUATION_LINES)):
+            lines.append(f"- <b>{area.split()[0]}Station</b>: {self.random.randint(0, 30)}")
+        return lines
+
+    def __announcement(self) -> list[str]:
+        fields = self.__fields()
+        lines = [f"[{self.__timestamp()}] SAY: {fields['admin']} (priority announcement) {fields['text']}"]
+        for _ in range(self.random.randint(1, MAX_CONTINUATION_LINES)):
+            lines.append("- " + self.__text())
+        return lines
+
+
+def generate_lines(count: int, seed: int = 0) -> list[str]:
+    """Returns about `count` log lines"""
+    return list(CorpusGenerator(seed).lines(count))
+
+
+def write_corpus(filename: str, count: int, seed: int = 0) -> None:
+    """Writes about `count` log lines to `filename`"""
+    CorpusGenerator(seed).write(filename, count)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    write_corpus(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 100_000)
@@ -0,0 +1,35 @@
+"""Measures how much memory a parsed `Log` takes up.
+
+Run with `python -m benchmarks.log_memory [number of logs]` from the repository root."""
+import gc
+import sys
+import tracemalloc
+
+from ss13_tools.log_buddy.log import Log
+
+from benchmarks.corpus import generate_lines
+
+
+def measure(count: int) -> None:
+    """Parses `count` lines and prints the memory used per log"""
+    # Lines continuing another log aren't logs on their own
+    lines = [line for line in generate_lines(count) if not line.startswith("- ")]
+    raw_size = sum(sys.getsizeof(line) for line in lines)
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    logs = [Log(line) for line in lines]
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_log = (after - before) / len(logs)
+    print(f"Parsed {len(logs)} logs")
+    print(f"Log object itself: {sys.getsizeof(logs[0])} bytes")
+    print(f"Total per log (object, parsed fields, players): {per_log:.0f} bytes")
+    print(f"Raw lines (shared, not counted above): {raw_size / len(lines):.0f} bytes per line")
+    print(f"Estimated for a million logs: {per_log * 1_000_000 / 1024 ** 2:.0f} MiB (+ raw lines)")
+
+
+if __name__ == "__main__":
+    measure(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,82 @@
+"""Measures how fast `LogFile.from_file` parses, and how much memory the result takes up, on a generated corpus
+(see `benchmarks.corpus`). Every way of loading a file is measured separately.
+
+Run with `python -m benchmarks.parser [number of lines]` from the repository root."""
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from contextlib import redirect_stderr
+from time import perf_counter
+from typing import Callable
+
+from ss13_tools.log_buddy import log_cache
+from ss13_tools.log_buddy.log_parser import LogFile
+
+from benchmarks.corpus import write_corpus
+
+# Best of this many runs, the others are noise
+REPEAT = 3
+MODES: dict[str, Callable[[str], object]] = {
+    "from_file": lambda filename: LogFile.from_file(filename, quiet=True),
+    "from_file(lazy=True)": lambda filename: LogFile.from_file(filename, quiet=True, lazy=True),
+    "from_file(mapped=True)": lambda filename: LogFile.from_file(filename, quiet=True, mapped=True),
+    "from_file(cache=True), cached": lambda filename: LogFile.from_file(filename, quiet=True, cache=True),
+    "iter_file": lambda filename: sum(1 for _ in LogFile.iter_file(filename, quiet=True)),
+}
+
+
+def time_mode(load: Callable[[str], object], filename: str) -> float:
+    """Returns the fastest time out of `REPEAT` loads"""
+    best = float("inf")
+    for _ in range(REPEAT):
+        gc.collect()
+        start = perf_counter()
+        result = load(filename)
+        best = min(best, perf_counter() - start)
+        if isinstance(result, LogFile):
+            # Mapped files stay open otherwise
+            result.close()
+    return best
+
+
+def memory_per_log(load: Callable[[str], object], filename: str) -> float:
+    """Returns how many bytes the loaded logs take up, per log. 0 if nothing is kept"""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = load(filename)
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if not isinstance(result, LogFile) or not result.unfiltered_logs:
+        return 0
+    result.close()
+    return (after - before) / len(result.unfiltered_logs)
+
+
+def run(count: int) -> None:
+    """Generates a corpus of `count` lines and prints the results for each mode"""
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "game.txt")
+        write_corpus(filename, count)
+        size = os.path.getsize(filename)
+        with open(filename, encoding="utf-8") as file:
+            lines = sum(1 for _ in file)
+        print(f"{lines} lines, {size / 1024 ** 2:.1f} MiB, best of {REPEAT}")
+        print(f"{'mode':<32}{'seconds':>10}{'lines/s':>12}{'bytes/log':>12}")
+        # Progress bars would make a mess of the table
+        with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stderr(devnull):
+            # Fill the cache first, so it's being read in the cached mode
+            LogFile.from_file(filename, quiet=True, cache=True)
+            for name, load in MODES.items():
+                seconds = time_mode(load, filename)
+                memory = memory_per_log(load, filename)
+                print(f"{name:<32}{seconds:>10.2f}{lines / seconds:>12.0f}{memory:>12.0f}")
+        # The cache isn't in the temporary folder, it's in the user's cache folder
+        os.remove(log_cache.cache_path(filename))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -1,6 +1,7 @@
 #!/env/python3
 
 import traceback
+from multiprocessing import freeze_support
 from random import choice
 import sys
 
@@ -9,6 +10,9 @@ from colorama import Fore, Style
 from ss13_tools.menu import MenuItem  # Absolute import because of pyinstaller
 from ss13_tools.constants import __version__
 
+# Bundled with pyinstaller, the processes LogBuddy parses in start this exe again.
+# This makes them do their work and exit, instead of opening the menu
+freeze_support()
 
 colour = choice([Fore.BLUE, Fore.CYAN, Fore.GREEN, Fore.LIGHTBLUE_EX, Fore.LIGHTCYAN_EX,
                 Fore.LIGHTGREEN_EX, Fore.LIGHTMAGENTA_EX, Fore.LIGHTRED_EX, Fore.LIGHTWHITE_EX,
@@ -1,11 +1,12 @@
 from colorama import init as colorama_init
 
-from .key_tools import canonicalize, user_exists
+from .key_tools import canonicalize, canonicalize_many, user_exists
 
 colorama_init()
 
 __all__ = [
     'canonicalize',
+    'canonicalize_many',
     'user_exists'
 ]
 
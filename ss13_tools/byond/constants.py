@@ -1 +1,3 @@
 BYOND_MEMBERS_URL = "https://www.byond.com/members/{ckey}"
+# How many keys canonicalize remembers. A round has a few hundred players
+CANONICALIZE_CACHE_SIZE = 4096
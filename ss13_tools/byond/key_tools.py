@@ -1,19 +1,42 @@
+from functools import lru_cache
 from string import ascii_lowercase, digits
 from urllib.parse import quote
-from typing import Generator
+from typing import Generator, Iterable
 import asyncio
 import sys
 
 import requests as req
 from aiohttp import ClientSession
 
-from .constants import BYOND_MEMBERS_URL
+from .constants import BYOND_MEMBERS_URL, CANONICALIZE_CACHE_SIZE
 from ..constants import USER_AGENT
 
 
+_CKEY_CHARACTERS = (ascii_lowercase + digits + '@').encode('ascii')
+# Every byte that can't be in a ckey. All of them are ASCII, so anything else is dropped when encoding
+_NOT_CKEY_BYTES = bytes(byte for byte in range(128) if byte not in _CKEY_CHARACTERS)
+# Same, but keeps the newlines canonicalize_many uses to separate keys
+_NOT_CKEY_OR_NEWLINE_BYTES = _NOT_CKEY_BYTES.replace(b'\n', b'')
+
+
+@lru_cache(maxsize=CANONICALIZE_CACHE_SIZE)
 def canonicalize(key: str) -> str:
     """Turns a user's key into canonical form (ckey)"""
-    return ''.join([letter for letter in key.lower() if letter in ascii_lowercase + digits + '@'])
+    return key.lower().encode('ascii', 'ignore').translate(None, _NOT_CKEY_BYTES).decode('ascii')
+
+
+def canonicalize_many(keys: Iterable[str]) -> list[str]:
+    """Turns a lot of keys into canonical form (ckeys) at once, in the same order.
+    Faster than calling `canonicalize` for each one if most of them weren't seen before"""
+    keys = list(keys)
+    if not keys:
+        return []
+    joined = '\n'.join(keys)
+    if joined.count('\n') != len(keys) - 1:
+        # A key has a newline in it, so we can't split them back up
+        return [canonicalize(key) for key in keys]
+    return joined.lower().encode('ascii', 'ignore').translate(None, _NOT_CKEY_OR_NEWLINE_BYTES)\
+                 .decode('ascii').split('\n')
 
 
 def user_exists(key: str) -> bool:
@@ -5,7 +5,10 @@ def run():
 
 def log_buddy():
     """Runs the main for LogBuddy, intended to be used with scripts"""
+    from multiprocessing import freeze_support  # pylint: disable=import-outside-toplevel
     from ss13_tools.log_buddy.__main__ import main  # noqa: F401 # pylint: disable=import-outside-toplevel,unused-import
+    # LogBuddy can parse in more processes, see `ss13_tools/__main__.py`
+    freeze_support()
     main()
 
 
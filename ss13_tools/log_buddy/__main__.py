@@ -3,6 +3,7 @@
 import inspect
 import os
 import sys
+from multiprocessing import freeze_support
 from typing import Any
 from colorama import Fore, init as colorama_init
 
@@ -58,7 +59,10 @@ def functions(cls: object) -> list[tuple[str, Any]]:
 
 def variables(cls: object) -> dict[str, Any]:
     """Returns all variables of an object"""
-    return cls.__dict__
+    if hasattr(cls, '__dict__'):
+        return cls.__dict__
+    # Log and Player use __slots__ to save memory, so they don't have a __dict__
+    return {name: getattr(cls, name) for name in dir(cls) if not name.startswith('_') and not callable(getattr(cls, name))}
 
 
 def main():
@@ -67,12 +71,14 @@ def main():
 
     logs = LogFile()
 
-    if len(sys.argv) > 1:
-        if len(sys.argv) == 2 and os.path.isdir(sys.argv[1]):
-            logs.collate(LogFile.from_folder(sys.argv[1]))
+    files = [arg for arg in sys.argv[1:] if arg != "--lazy"]
+    lazy = len(files) != len(sys.argv) - 1
+    if files:
+        if len(files) == 1 and os.path.isdir(files[0]):
+            logs.collate(LogFile.from_folder(files[0], lazy=lazy))
         else:
-            for file in sys.argv[1:]:
-                logs.collate(LogFile.from_file(file))
+            for file in files:
+                logs.collate(LogFile.from_file(file, lazy=lazy))
 
     # When you bundle everything with pyinstaller, help stops working for some reason
     help = _Helper()  # noqa: F841 pylint: disable=unused-variable,redefined-builtin
@@ -122,4 +128,6 @@ for IPython's help (without the quotes).
 
 
 if __name__ == "__main__":
+    # If it's bundled with pyinstaller, see `ss13_tools/__main__.py`
+    freeze_support()
     main()
@@ -0,0 +1,85 @@
+"""Finds the logs a ckey shows up in without going through all of them"""
+from typing import Annotated
+
+from .log import Log
+from .log_index import LogIndex
+from .expressions import CKEY_MENTION_REGEX
+from ..byond import canonicalize
+
+
+class CkeyIndex(LogIndex):
+    """Where each ckey shows up in a list of logs: as the agent, as the patient, or mentioned in the text
+    (`ckey/(name)`). Each ckey has a list of positions in the list, smallest first. See `LogIndex`
+
+    Parameters:
+    `logs` (list[Log]): logs to index
+
+    Examples:
+    `index = CkeyIndex(my_logs.unfiltered_logs)`
+    `index.find("ckey1", "ckey2")` # Positions of logs where either is the agent or the patient
+    `"ckey1" in index` # Is it the agent or the patient of any log
+    """
+    __slots__ = ('agent', 'patient', 'mentioned')
+
+    agent: Annotated[dict[str, list[int]], "Positions of logs by the ckey of their agent"]
+    patient: Annotated[dict[str, list[int]], "Positions of logs by the ckey of their patient"]
+    mentioned: Annotated[dict[str, list[int]], "Positions of logs by the ckeys mentioned in their text"]
+
+    def __init__(self, logs: list[Log], generation: int = 0) -> None:
+        super().__init__(logs, generation)
+        self.agent = {}
+        self.patient = {}
+        self.mentioned = {}
+        self.extend()
+
+    def _add(self, logs: list[Log], start: int) -> None:
+        mentions = []
+        for position, log in enumerate(logs, start):
+            if log.agent is not None and log.agent.ckey:
+                self.agent.setdefault(log.agent.ckey, []).append(position)
+            if log.patient is not None and log.patient.ckey:
+                self.patient.setdefault(log.patient.ckey, []).append(position)
+            if log.text and "/(" in log.text:
+                mentions.append((position, CKEY_MENTION_REGEX.findall(log.text)))
+        # After all the agents and patients are known, see `__mentioned_ckey`
+        for position, keys in mentions:
+            # A set, the same player is often mentioned more than once
+            for ckey in {self.__mentioned_ckey(key) for key in keys}:
+                self.mentioned.setdefault(ckey, []).append(position)
+
+    def __mentioned_ckey(self, words: str) -> str:
+        """Keys can have spaces, so the words before "/(" can be more than the key ("has attacked Some Key").
+        The key is the most words that make the ckey of an agent or a patient, or the last word if none do"""
+        if " " not in words:
+            return canonicalize(words)
+        # Words come up over and over, the whole string doesn't
+        parts = [canonicalize(part) for part in words.split()]
+        for begin in range(len(parts) - 1):
+            ckey = "".join(parts[begin:])
+            if ckey in self.agent or ckey in self.patient:
+                return ckey
+        return parts[-1]
+
+    def __contains__(self, ckey: str) -> bool:
+        """Is this ckey the agent or the patient of any log? The ckey doesn't have to be canonical"""
+        ckey = canonicalize(ckey)
+        return ckey in self.agent or ckey in self.patient
+
+    def find(self, *ckeys: str, agent: bool = True, patient: bool = True, mentioned: bool = False) -> set[int]:
+        """Returns the positions of logs in which any of the ckeys shows up. Ckeys don't have to be canonical
+
+        Parameters:
+        `ckeys` (tuple[str, ...]): ckeys to look for
+        `agent` (bool): look for them as the agent (True by default)
+        `patient` (bool): look for them as the patient (True by default)
+        `mentioned` (bool): look for them in the text (False by default)
+
+        Returns `set[int]`"""
+        postings = [posting for posting, wanted in ((self.agent, agent), (self.patient, patient),
+                                                    (self.mentioned, mentioned)) if wanted]
+        positions = set()
+        for ckey in ckeys:
+            ckey = canonicalize(ckey)
+            for posting in postings:
+                positions.update(posting.get(ckey, ()))
+        return positions
@@ -1,3 +1,5 @@
+import os
+
 from ..constants import __version__
 
 ALL_LOGS_WE_PARSE = [
@@ -15,6 +17,26 @@ HELP_LINK = "https://github.com/RigglePrime/SS13-tools/blob/master/ss13_tools/lo
 SHAMELESS = f"## Created using SS13-Tools LogBuddy {__version__} https://github.com/RigglePrime/SS13-Tools\n"
 ERRORED_FILE = "errored.log"
 MAX_SUPPORTED_LOG_VERSION = "1.0.0"
+# More chunks than processes, so a process that finishes early gets more work
+PARALLEL_CHUNKS_PER_PROCESS = 4
+# Smaller chunks spend more time being sent between processes than parsed
+PARALLEL_MIN_CHUNK_SIZE = 10_000
+# Where parsed log caches are saved, inside the user's cache folder
+CACHE_FOLDER = os.path.join("ss13-tools", "logbuddy")
+# Added to the name of a parsed log cache
+CACHE_SUFFIX = ".logbuddy-cache"
+# How many of the slowest lines parse statistics remember
+PARSE_STATS_SLOWEST = 10
+# How many tiles wide each chunk of the spatial index is. About twice the hearing range
+SPATIAL_CHUNK_SIZE = 16
+# How much memory (in bytes) the work sets kept for %undo and %redo can take. The oldest are forgotten first
+UNDO_MEMORY_LIMIT = 64 * 1024 * 1024
+# How many logs a query checks each of its filters on before deciding which to check first
+QUERY_SAMPLE_SIZE = 200
+# How many seconds following a log file waits before looking for new lines again
+FOLLOW_INTERVAL = 2
+# How many players and locations a registry that no LogFile owns remembers before it starts over
+UNOWNED_REGISTRY_LIMIT = 10_000
 
 LOG_COLOUR_SCARLET = 124
 LOG_COLOUR_RED = 167
@@ -13,6 +13,8 @@ VIRUS_INFECTED_OR_CURED_REGEX = re.compile(r" was (?:infected by|cured of) virus
 COMBAT_MODE_REGEX = re.compile(r"\(COMBAT MODE: (\d)\)")
 DAMTYPE_REGEX = re.compile(r"\(DAMTYPE: (\w+)\)")
 NEW_HP_REGEX = re.compile(r"\(NEWHP: (-?\d+\.?\d?)\)")
+# Keys can have spaces. Starting only where a run of words starts keeps it from trying every word in it
+CKEY_MENTION_REGEX = re.compile(r"(?<![\w@])(?<![\w@] )([\w@][\w@ ]*)/\(")
 
 LOG_PRETTY_STR = re.compile(r'"(?:.*)"')
 LOG_PRETTY_LOC = LOC_REGEX
@@ -0,0 +1,114 @@
+"""Keeps a LogFile up to date with a log file that's still being written"""
+from __future__ import annotations
+
+import os
+from time import sleep
+from typing import TYPE_CHECKING, Annotated, Callable, Optional
+
+from .log import Log
+from .query import Query
+from .working_set import WorkingSet
+from .constants import FOLLOW_INTERVAL
+
+if TYPE_CHECKING:
+    from .log_parser import LogFile
+
+
+class LogFollower:
+    """Reads what was written to a log file since the last time and adds the logs to a LogFile, like `tail -f`.
+    Only the new bytes are read. A line that isn't finished yet waits for the rest of it, and the last log waits
+    for the next one to start (or for a poll with nothing new and no unfinished line), since more lines might
+    still continue it.
+    If the file gets smaller it was replaced (a new round), so it's read from the start again.
+
+    New logs that are the latest are appended and the indexes take them in, nothing is built again. They're
+    added to the work set if they pass `query`, or if there's no query and the work set had every log.
+
+    Parameters:
+    `log_file` (LogFile): where the logs go
+    `filename` (str): the file to follow
+    `query` (Callable[[Query], Query]): adds the filters new logs have to pass to be in the work set (optional)
+    `from_end` (bool): skip what's in the file now, if you loaded it already (False by default)
+    `quiet` (bool): don't print lines that can't be parsed (False by default)
+
+    Examples:
+    `follower = LogFollower(my_logs, "game.txt", lambda query: query.ckey("ckey1"))`
+    `follower.poll()` # The new logs that went into the work set
+    `follower.follow()` # Prints them as they come, until Ctrl+C
+    """
+    __slots__ = ('log_file', 'filename', 'query', 'quiet', 'offset', 'partial', 'held')
+
+    log_file: LogFile
+    filename: str
+    query: Annotated[Optional[Callable[[Query], Query]], "Adds the filters new logs have to pass"]
+    quiet: bool
+    offset: Annotated[int, "How many bytes of the file were read"]
+    partial: Annotated[bytes, "The end of the file that isn't a whole line yet"]
+    held: Annotated[list[str], "Lines of the last log, waiting in case more lines continue it"]
+
+    def __init__(self, log_file: LogFile, filename: str, query: Callable[[Query], Query] = None,
+                 from_end: bool = False, quiet: bool = False) -> None:
+        self.log_file = log_file
+        self.filename = filename
+        self.query = query
+        self.quiet = quiet
+        self.offset = os.path.getsize(filename) if from_end else 0
+        self.partial = b""
+        self.held = []
+
+    def poll(self) -> list[Log]:
+        """Adds the logs written since the last poll. Returns the ones that went into the work set"""
+        lines = self.__read()
+        if not lines:
+            return []
+        log_file = self.log_file
+        everything = len(log_file.logs) == len(log_file.unfiltered_logs)
+        new = log_file.add_lines(lines, quiet=self.quiet)
+        if not new:
+            return []
+        # Adding them made `logfile_pos` where they are
+        added = WorkingSet.from_positions(log_file.unfiltered_logs, (log.logfile_pos for log in new))
+        if self.query is not None:
+            added = self.query(Query(log_file)).matching(added)
+        elif not everything:
+            return []
+        log_file.logs = log_file.logs | added
+        return list(added)
+
+    def follow(self, interval: float = FOLLOW_INTERVAL) -> None:
+        """Polls every `interval` seconds and prints the logs that go into the work set, until Ctrl+C"""
+        try:
+            while True:
+                for log in self.poll():
+                    print(log.pretty())
+                sleep(interval)
+        except KeyboardInterrupt:
+            print("Stopped following", self.filename)
+
+    def __read(self) -> list[str]:
+        """Returns the whole lines written since the last read, without the ones that have to wait"""
+        with open(self.filename, "rb") as file:
+            if os.fstat(file.fileno()).st_size < self.offset:
+                self.offset = 0
+                self.partial = b""
+                self.held = []
+            file.seek(self.offset)
+            data = file.read()
+        self.offset += len(data)
+        data = self.partial + data
+        end = data.rfind(b"\n") + 1
+        self.partial = data[end:]
+        if not end:
+            if self.partial:
+                # A line is still being written, and it could be continuing the last log
+                return []
+            # Nothing new, so nothing is going to continue the last log
+            lines, self.held = self.held, []
+            return lines
+        lines = self.held + data[:end].decode("utf-8").splitlines()
+        # Hold back from where the last log starts. If none starts, it's all still the held one
+        start = len(lines) - 1
+        while start > 0 and (not lines[start].strip() or lines[start].lstrip().startswith("- ")):
+            start -= 1
+        self.held = lines[start:]
+        return lines[:start]
@@ -0,0 +1,105 @@
+"""Works out what players could have heard"""
+from bisect import bisect_left
+from typing import Annotated, Iterable, Optional
+
+from .log import Log, LogType
+from .ckey_index import CkeyIndex
+from .log_index import LogIndex
+
+# Where a player is before we know anything
+NOWHERE = (0, 0, 0)
+
+
+class Timeline:
+    """Where a player was: the positions of the logs they're in, and of those with a location, where they were
+
+    Parameters:
+    `involved` (set[int]): positions of the logs the player is in
+    `logs` (list[Log]): the logs the positions point to
+    """
+    __slots__ = ('involved', 'positions', 'locations')
+
+    involved: Annotated[set[int], "Positions of the logs the player is in"]
+    positions: Annotated[list[int], "Positions of the logs the player is in that have a location, smallest first"]
+    locations: Annotated[list[tuple[int, int, int]], "Where the player was at each of `positions`"]
+
+    def __init__(self, involved: set[int], logs: list[Log]) -> None:
+        self.involved = involved
+        self.positions = [position for position in sorted(involved) if logs[position].location]
+        self.locations = [logs[position].location for position in self.positions]
+
+    def where(self, position: int) -> tuple[tuple[int, int, int], tuple[int, int, int]]:
+        """Returns the last two places the player was seen at before `position`, latest first"""
+        seen = bisect_left(self.positions, position)
+        current = self.locations[seen - 1] if seen > 0 else NOWHERE
+        previous = self.locations[seen - 2] if seen > 1 else NOWHERE
+        return current, previous
+
+
+class HearingEngine(LogIndex):
+    """Works out what players could have heard, going through the logs once for any number of them. A player
+    hears every log they're in, and logs close enough to where they were last seen. Tcomms is always heard.
+    We don't know where someone is right after they change z levels, so nothing around them is heard then.
+
+    Kept current like an index, see `LogIndex`. If logs were added to the end of the list, `extend` the ckey
+    index and then the engine.
+
+    Parameters:
+    `logs` (list[Log]): logs sorted by time
+    `ckey_index` (CkeyIndex): index of the same logs
+
+    Examples:
+    `engine = HearingEngine(my_logs.unfiltered_logs, my_logs.ckey_index)`
+    `engine.heard(["ckey1", "ckey2"], 13)` # Positions of logs each of them could have heard
+    """
+    __slots__ = ('ckey_index', 'timelines')
+
+    ckey_index: CkeyIndex
+    timelines: Annotated[dict[str, Timeline], "Timelines of players we already looked at"]
+
+    def __init__(self, logs: list[Log], ckey_index: CkeyIndex, generation: int = 0) -> None:
+        super().__init__(logs, generation)
+        self.ckey_index = ckey_index
+        self.timelines = {}
+        self.size = len(logs)
+
+    def _add(self, logs: list[Log], start: int) -> None:
+        # Timelines are made again when needed
+        self.timelines.clear()
+
+    def timeline(self, ckey: str) -> Timeline:
+        """Returns where the player was, see `Timeline`"""
+        timeline = self.timelines.get(ckey)
+        if timeline is None:
+            timeline = self.timelines[ckey] = Timeline(self.ckey_index.find(ckey, mentioned=True), self.logs)
+        return timeline
+
+    def heard(self, ckeys: Iterable[str], hearing_range: int,
+              log_types: Optional[Iterable[LogType]] = None) -> dict[str, set[int]]:
+        """Returns the positions of the logs each player could have heard
+
+        Parameters:
+        `ckeys` (Iterable[str]): the players
+        `hearing_range` (int): how far away (in tiles, on both axes) a log can be heard
+        `log_types` (Iterable[LogType]): only hear these types of logs, besides the ones they're in (optional)
+
+        Returns `dict[str, set[int]]`"""
+        timelines = {ckey: self.timeline(ckey) for ckey in ckeys}
+        heard = {ckey: set(timeline.involved) for ckey, timeline in timelines.items()}
+        log_types = frozenset(log_types) if log_types is not None else None
+        for position, log in enumerate(self.logs):
+            # Logs without a location are only heard by the players in them
+            location = log.location
+            if not location or (log_types is not None and log.log_type not in log_types):
+                continue
+            tcomms = log.log_type == LogType.TCOMMS
+            for ckey, timeline in timelines.items():
+                if position in timeline.involved:
+                    continue
+                current, previous = timeline.where(position)
+                if current[2] != previous[2]:
+                    continue
+                if tcomms or (abs(current[0] - location[0]) < hearing_range
+                              and abs(current[1] - location[1]) < hearing_range):
+                    heard[ckey].add(position)
+        return heard
@@ -2,13 +2,15 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Annotated, Tuple, Optional
+from typing import Annotated, Callable, Tuple, Optional
 from html import unescape as html_unescape
+from operator import attrgetter
+from sys import intern
 import json
 
 from colorama import init
-from dateutil.parser import isoparse
 
+from ss13_tools.__version__ import __version__
 from ss13_tools.byond import canonicalize
 from ss13_tools.log_buddy.expressions import COMBAT_MODE_REGEX, DAMTYPE_REGEX, LOC_REGEX, \
     ADMIN_BUILD_MODE_REGEX, ADMIN_STAT_CHANGE_REGEX, HORRIBLE_HREF_REGEX, GAME_I_LOVE_BOMBS_REGEX, \
@@ -17,7 +19,9 @@ from ss13_tools.log_buddy.expressions import COMBAT_MODE_REGEX, DAMTYPE_REGEX, L
 from ss13_tools.log_buddy.constants import LOG_COLOUR_SCARLET, LOG_COLOUR_RED, LOG_COLOUR_EMERALD, \
     LOG_COLOUR_PERIWINKLE, LOG_COLOUR_PINK, LOG_COLOUR_GRAY, LOG_COLOUR_PASTEL_CYAN, LOG_COLOUR_SUNSET, \
     LOG_COLOUR_PASTEL_ORANGE, LOG_COLOUR_AMETHYST, LOG_COLOUR_OCEAN, \
-    MAX_SUPPORTED_LOG_VERSION
+    MAX_SUPPORTED_LOG_VERSION, UNOWNED_REGISTRY_LIMIT, ERRORED_FILE
+from ss13_tools.log_buddy.timestamps import decode_timestamp
+from ss13_tools.log_buddy.log_source import MappedLogSource
 
 
 class LogType(Enum):
@@ -52,10 +56,7 @@ class LogType(Enum):
     @staticmethod
     def parse_log_type(string: str):
         """Gets the log type from a string"""
-        try:
-            return LogType[string.upper()]
-        except KeyError:
-            return LogType.UNKNOWN
+        return LogType.__members__.get(string.upper(), LogType.UNKNOWN)
 
 
 class DamageType(Enum):
@@ -126,23 +127,28 @@ class AdminprivateLogType(Enum):
 
 class Player:
     """This class holds methods for parsing ckey strings ('ckey/(name)')"""
+    __slots__ = ('ckey', 'key', 'mob_name')
+
     ckey: Optional[str]
     key: Optional[str]
     mob_name: Optional[str]
 
     def __init__(self, ckey: str, mob_name: str) -> None:
-        self.key = ckey
+        # The same few hundred players show up in every log line, so share the strings
+        self.key = intern(ckey) if ckey else ckey
         self.ckey = None if ckey == "*no key*" else ckey
         if self.ckey:
             if self.ckey.startswith('@'):
                 self.ckey = self.ckey[1:]
             if self.ckey.endswith('[DC]'):
                 self.ckey = self.ckey[:-4]
-            self.ckey = canonicalize(self.ckey)
+            self.ckey = intern(canonicalize(self.ckey))
         self.mob_name = mob_name
         # We usually strip the closing bracket, what's one more string concat?
         if self.mob_name and '(' in self.mob_name:
             self.mob_name += ')'
+        if self.mob_name:
+            self.mob_name = intern(self.mob_name)
 
     def __str__(self) -> str:
         if not self.mob_name:
@@ -173,6 +179,89 @@ class Player:
         raise NotImplementedError("Not yet implemented")
 
 
+class PlayerRegistry:
+    """Hands out one shared `Player` for every distinct ckey and name, so a player that shows up
+    in thousands of lines is only parsed and stored once. Equal locations are shared the same way.
+    Players from a registry must not be modified
+
+    Parameters:
+    `limit` (int): start over once it holds more players and locations than this. For registries
+    no LogFile owns, which would otherwise grow forever (no limit by default)
+
+    Examples:
+    `players = PlayerRegistry()`
+    `players.parse_player("ckey/(John Smith)") is players.parse_player("ckey/(John Smith)")` # True"""
+    __slots__ = ('_players', '_by_string', '_by_fields', '_locations', 'limit')
+
+    _players: Annotated[dict[Tuple[Optional[str], Optional[str]], Player], "Players by ckey and mob name"]
+    _by_string: Annotated[dict[str, Player], "Players by the exact string they were parsed from"]
+    _by_fields: Annotated[dict[Tuple[Optional[str], ...], Player], "Players by key, ckey and mob name"]
+    _locations: Annotated[dict[Tuple[int, int, int], Tuple[int, int, int]], "Every location seen so far"]
+    limit: Annotated[Optional[int], "How many players and locations it holds before starting over"]
+
+    def __init__(self, limit: Optional[int] = None) -> None:
+        self._players = {}
+        self._by_string = {}
+        self._by_fields = {}
+        self._locations = {}
+        self.limit = limit
+
+    def get(self, ckey: Optional[str], mob_name: Optional[str]) -> Player:
+        """Same as `Player(ckey, mob_name)`, but returns the existing player if there is one"""
+        player = self._players.get((ckey, mob_name))
+        if player is None:
+            self.__make_room()
+            player = self._players[(ckey, mob_name)] = self.share(Player(ckey, mob_name))
+        return player
+
+    def share(self, player: Player) -> Player:
+        """Returns the registry's player equal to `player`, adding `player` if there isn't one.
+        Useful for players that were made somewhere else, like in another process"""
+        fields = (player.key, player.ckey, player.mob_name)
+        shared = self._by_fields.get(fields)
+        if shared is None:
+            self.__make_room()
+            shared = self._by_fields[fields] = player
+        return shared
+
+    def parse_player(self, string: str) -> Player:
+        """Same as `Player.parse_player`, but returns the existing player if there is one"""
+        player = self._by_string.get(string)
+        if player is None:
+            ckey, name = string.strip().split("/", 1)
+            player = self.get(ckey, name.strip("()"))
+            self.__make_room()
+            self._by_string[string] = player
+        return player
+
+    def share_location(self, location: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        """Returns the registry's location equal to `location`, adding it if there isn't one"""
+        shared = self._locations.get(location)
+        if shared is None:
+            self.__make_room()
+            shared = self._locations[location] = location
+        return shared
+
+    def __make_room(self) -> None:
+        """Starts over if there's a limit and it was reached"""
+        if self.limit is not None and \
+                len(self._players) + len(self._by_string) + len(self._by_fields) + len(self._locations) >= self.limit:
+            self.clear()
+
+    def clear(self) -> None:
+        """Forgets all players and locations. The ones handed out before stay valid, they just won't be shared anymore"""
+        self._players.clear()
+        self._by_string.clear()
+        self._by_fields.clear()
+        self._locations.clear()
+
+    def __len__(self) -> int:
+        return len(self._by_fields)
+
+    def __iter__(self):
+        return iter(self._by_fields.values())
+
+
 class UnknownLogException(Exception):
     """Thrown when a log type is not known. (so unexpected!)"""
 
@@ -181,37 +270,224 @@ class UnsupportedSchemaVersionException(Exception):
     """Thrown when a JSON log schema isn't supported. (so unexpected!)"""
 
 
+class LogDetails:
+    """Base for the small structures holding fields only some log types have. Unset fields are None"""
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class AttackDetails(LogDetails):
+    """Attack specific fields"""
+    __slots__ = ('combat_mode', 'damage_type', 'new_hp')
+
+    combat_mode: Annotated[Optional[bool], "Was combat mode on or off"]
+    damage_type: Annotated[Optional[DamageType], "The damage type"]
+    new_hp: Annotated[Optional[float], "The new hp of the patient"]
+
+
+class SiliconDetails(LogDetails):
+    """Silicon specific fields"""
+    __slots__ = ('silicon_log_type',)
+
+    silicon_log_type: Annotated[Optional[SiliconLogType], "The subtype of the silicon log"]
+
+
+class VirusDetails(LogDetails):
+    """Virus specific fields"""
+    __slots__ = ('virus_name',)
+
+    virus_name: Annotated[Optional[str], "The name of the virus"]
+
+
+class TelecommsDetails(LogDetails):
+    """Telecomms specific fields"""
+    __slots__ = ('telecomms_network',)
+
+    telecomms_network: Annotated[Optional[str], "The network on which the message was spoken on"]
+
+
+class AdminDetails(LogDetails):
+    """Admin specific fields"""
+    __slots__ = ('admin_log_type',)
+
+    admin_log_type: Annotated[Optional[AdminLogType], "What kind of admin log it is"]
+
+
+class AdminprivateDetails(LogDetails):
+    """Adminprivate specific fields"""
+    __slots__ = ('adminprivate_log_type', 'ticket_number')
+
+    adminprivate_log_type: Annotated[Optional[AdminprivateLogType], "What kind of adminprivate log it is"]
+    ticket_number: Annotated[Optional[int], "The ticket number, if this log is a ticket"]
+
+
+def _details_field(details_type: type, name: str, doc: str) -> property:
+    """Creates a property that stores `name` on the `details_type` structure of a log,
+    creating the structure the first time the field is set. Reads return None if the log has no such field"""
+    def getter(self):
+        details = self.details
+        if isinstance(details, details_type):
+            return getattr(details, name)
+        return None
+
+    def setter(self, value):
+        if not isinstance(self.details, details_type):
+            self.details = details_type()
+        setattr(self.details, name, value)
+    return property(getter, setter, doc=doc)
+
+
 class Log:
     """Represents one log entry
 
+    Parameters:
+    `line` (str): the log line
+    `lazy` (bool): only parse the time, type and (where it's cheap) the agent right away. Everything else
+    is parsed the first time it's read. If that fails, fields that couldn't be parsed stay None
+    `players` (PlayerRegistry): where to get players from, so equal players are shared between logs.
+    Defaults to one registry shared by all logs that don't specify it
+
     Examples:
     log = `Log("log line here")` # NOTE: must be a valid log entry"""
-
-    def __init__(self, line: Optional[str] = None) -> None:
+    # A log file can have millions of these, so no __dict__. Fields only some
+    # log types have live in a small structure in `details` instead
+    __slots__ = ('json_schema', 'time', 'agent', 'patient', '_raw_line', 'log_type', 'location',
+                 'location_name', 'text', 'is_dead', 'logfile_pos', 'details', '_players', '_source')
+    # `raw_line` of a log without a `source`, straight from the slot. Much faster than the property over many
+    # logs, but for a log with a source it's the line number (see `use_source`)
+    kept_line = staticmethod(attrgetter('_raw_line'))
+
+    def __init__(self, line: Optional[str] = None, lazy: bool = False, players: PlayerRegistry = None) -> None:
         if not line:
             raise UnknownLogException("Log line empty!")
 
+        self._players = players if players is not None else _DEFAULT_PLAYERS
+
         self.json_schema = None
         self.time = None
+        self.log_type = None
+        self.logfile_pos = None
+        self._raw_line = line
+        self._source = None
+        if lazy:
+            # Leaving the slots empty means __getattr__ gets called when one of them is read
+            self.__parse(details=False)
+            return
+        self.__clear_details()
+        self.__parse()
+
+    def __getattr__(self, name: str):
+        # Only called when a slot is empty, which means the log was loaded lazily and we still need to parse it
+        if name not in _LAZY_FIELDS:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        self.__clear_details()
+        try:
+            self.__parse()
+        except Exception:  # pylint: disable=broad-exception-caught
+            # Same as a line that can't be parsed, but we can't drop it anymore. It stays with whatever
+            # couldn't be parsed left as None, so at least let it be reported like the others
+            write_errored([self.raw_line])
+        return object.__getattribute__(self, name)
+
+    def __reduce__(self):
+        # Used by pickle, which is how logs get back from other processes. A tuple is much faster than the
+        # default. The player registry stays behind (see `share_players`)
+        return Log._unpickle, (self._fields(),)
+
+    def _fields(self) -> tuple:
+        """The fields in `_PICKLED_FIELDS` order, without the ones that weren't parsed yet
+        (they're always the last ones)"""
+        if _is_slot_set(Log.details, self):
+            return _get_pickled_fields(self)
+        fields = _get_eager_fields(self)
+        if _is_slot_set(Log.agent, self):
+            fields += (self.agent,)
+        return fields
+
+    @staticmethod
+    def _unpickle(fields: tuple) -> 'Log':
+        """Counterpart to `__reduce__` and `_fields`"""
+        log = Log.__new__(Log)
+        log._players = _DEFAULT_PLAYERS  # pylint: disable=protected-access
+        for name, value in zip(_PICKLED_FIELDS, fields):
+            setattr(log, name, value)
+        return log
+
+    @property
+    def raw_line(self) -> str:
+        """Raw, unmodified line"""
+        if self._source is None:
+            return self._raw_line
+        # It's the line number instead, see `use_source`
+        return self._source.line(self._raw_line)
+
+    @raw_line.setter
+    def raw_line(self, line: str) -> None:
+        self._raw_line = line
+        self._source = None
+
+    @property
+    def source(self) -> Optional[MappedLogSource]:
+        """The mapped file the line is read from, None if the log keeps its line (see `use_source`)"""
+        return self._source
+
+    def use_source(self, source: MappedLogSource, index: int) -> None:
+        """Drops the raw line and reads it from line `index` of `source` whenever it's needed instead.
+        The line must be the same one this log was parsed from"""
+        self._raw_line = index
+        self._source = source
+
+    def share_players(self, players: PlayerRegistry) -> None:
+        """Makes this log use `players`, swapping its agent, patient and location for the registry's equal ones.
+        Useful for logs that were parsed somewhere else, like in another process"""
+        self._players = players
+        for name in ('agent', 'patient'):
+            if not _is_slot_set(getattr(Log, name), self):
+                continue  # Not parsed yet, will come from `players` when it is
+            player = getattr(self, name)
+            if player:
+                setattr(self, name, players.share(player))
+        if _is_slot_set(Log.location, self) and self.location:
+            self.location = players.share_location(self.location)
+
+    def __clear_details(self) -> None:
         self.agent = None
         self.patient = None
         self.location = None
         self.location_name = None
         self.text = None
         self.is_dead = None
-        self.raw_line = line
+        self.details = None
 
+    def __parse(self, details: bool = True) -> None:
+        """Parses the raw line. If `details` is False, only the time, type and agent (if it's cheap) are parsed"""
+        line = self.raw_line
         if line[0] == "{":
-            self.__json_parse()
-            return
-        if line[0] == "[":
-            self.__parse_old_log()
-            return
-        raise UnknownLogException("Unsupported log")
-
-    def __parse_old_log(self):
-        date_time, other = self.raw_line.split("] ", 1)
-        self.time = isoparse(date_time[1:])  # Remove starting [
+            self.__json_parse(line, details)
+        elif line[0] == "[":
+            self.__parse_old_log(line, details)
+        else:
+            raise UnknownLogException("Unsupported log")
+        if details:
+            self.__share_fields()
+
+    def __share_fields(self) -> None:
+        """Makes logs share equal locations and location names instead of each one holding a copy"""
+        if self.location:
+            self.location = self._players.share_location(self.location)
+        if self.location_name:
+            self.location_name = intern(self.location_name)
+
+    def __parse_old_log(self, line: str, details: bool = True):
+        date_time, other = line.split("] ", 1)
+        self.time = decode_timestamp(date_time[1:])  # Remove starting [
         if other.endswith("VOTE:"):
             other += " "
 
@@ -226,17 +502,14 @@ class Log:
             # Is that even possible? I am too lazy to make sure and will assume it's not.
             # If it is, hi! Welcome to hell. Please edit the conditional before to work.
             # Just know that it will catch false positives. What fun world of logging we live in.
-            self.parse_tgui(other)
+            if details:
+                self.parse_tgui(other)
             return
-        log_type, other = other.split(": ", 1)
-        self.log_type = LogType.parse_log_type(log_type.replace("GAME-", "", 1))
-        # Python go brrrrrrr
-        parsing_function = getattr(self, f"parse_{self.log_type.name.lower()}", None)
-        if parsing_function:
-            parsing_function(other)
+        category, other = other.split(": ", 1)
+        self.__dispatch(category, other, details)
 
-    def __json_parse(self):
-        log = json.loads(self.raw_line)
+    def __json_parse(self, line: str, details: bool = True):
+        log = json.loads(line)
         if not log['s-ver'].count('.') == 2:
             raise UnknownLogException("Schema version corrupted")
         max_supported = tuple(int(x) for x in MAX_SUPPORTED_LOG_VERSION.split('.'))
@@ -247,51 +520,72 @@ class Log:
             if max_supported[i] < schema_version[i]:
                 raise UnsupportedSchemaVersionException(f"Unsupported schema: {log['s-ver']}")
         self.json_schema = log['s-ver']
-        self.time = isoparse(log['ts'])
-        self.log_type = LogType.parse_log_type(log['cat'].replace("game-", "", 1))
-        parsing_function = getattr(self, f"parse_{self.log_type.name.lower()}", None)
-        if parsing_function:
-            parsing_function(log['msg'])
+        self.time = decode_timestamp(log['ts'])
+        self.__dispatch(log['cat'], log['msg'], details)
 
-    json_schema = Annotated[str, "JSON schema version. None if not a JSON log"]
+    def __dispatch(self, category: str, log: str, details: bool = True) -> None:
+        """Sets the log type from the category (`GAME-SAY`, `ATTACK`, `game-say`...) and runs its parser.
+        If `details` is False the parser isn't run, and the agent is only parsed if it's at the start of the line"""
+        # Python go brrrrrrr
+        entry = _CATEGORY_PARSERS.get(category)
+        if not entry:
+            # Strange capitalisation or a type we don't know, take the slow path
+            log_type = LogType.parse_log_type(category.replace("GAME-", "", 1).replace("game-", "", 1))
+            entry = _CATEGORY_PARSERS[log_type.name]
+        self.log_type, parsing_function, agent_first = entry
+        if details:
+            if parsing_function:
+                parsing_function(self, log)
+        elif agent_first:
+            # Exactly what the parser would do
+            agent, _ = log.split(") ", 1)
+            self.agent = self._players.parse_player(agent)
+
+    json_schema: Annotated[Optional[str], "JSON schema version. None if not a JSON log"]
     time: Annotated[datetime, "Time of logging"]
     agent: Annotated[Optional[Player], "Player performing the action"]
     patient: Annotated[Optional[Player], "Player receiving the action"]
-    raw_line: Annotated[str, "Raw, unmodified line"]
     log_type: Annotated[LogType, "Type of the log"]
     location: Annotated[Optional[Tuple[int, int, int]], "X, Y, Y where the action was performed"]
     location_name: Annotated[Optional[str], "Name of the location where the action was performed"]
     text: Annotated[Optional[str], "Any remaining unparsed text"]
     is_dead: Annotated[Optional[bool], "Is the agent dead?"]
+    logfile_pos: Annotated[Optional[int], "Position of the log in the LogFile it was loaded into"]
+    details: Annotated[Optional[LogDetails], "Fields specific to the log type, see the properties below"]
 
     # Attack specific
-    combat_mode: Annotated[bool, "This variable will store if the combat mode was on or off (only applies to attack logs)"]
-    damage_type: Annotated[DamageType, "If the log type is attack, the damage type will be stored here"]
-    new_hp: Annotated[float, "If the log type is attack, the new hp info will be stored here"]
+    combat_mode = _details_field(AttackDetails, "combat_mode",
+                                 "This variable will store if the combat mode was on or off (only applies to attack logs)")
+    damage_type = _details_field(AttackDetails, "damage_type",
+                                 "If the log type is attack, the damage type will be stored here")
+    new_hp = _details_field(AttackDetails, "new_hp", "If the log type is attack, the new hp info will be stored here")
 
     # Silicon specific
-    silicon_log_type: Annotated[SiliconLogType, "If log type is silicon, it will represent the subtype, otherwise None"]
+    silicon_log_type = _details_field(SiliconDetails, "silicon_log_type",
+                                      "If log type is silicon, it will represent the subtype, otherwise None")
 
     # Virus specific
-    virus_name: Annotated[SiliconLogType, "If log type is virus, it will store the virus name"]
+    virus_name = _details_field(VirusDetails, "virus_name", "If log type is virus, it will store the virus name")
 
     # Telecomms specific
-    telecomms_network: Annotated[str, "If log type is TCOMMS, the network on which the message was spoken \
-                                      on will be stored here"]
+    telecomms_network = _details_field(TelecommsDetails, "telecomms_network",
+                                       "If log type is TCOMMS, the network the message was spoken on will be stored here")
 
     # Admin specific
-    admin_log_type: Annotated[AdminLogType, "Sores what kind of admin log it is (None if not an admin log)"]
+    admin_log_type = _details_field(AdminDetails, "admin_log_type",
+                                    "Stores what kind of admin log it is (None if not an admin log)")
 
     # Adminprivate specific
-    adminprivate_log_type: Annotated[AdminprivateLogType, "Sores what kind of admin log it is (None if not an admin log)"]
-    ticket_number: Annotated[int, "Stores the ticket number, if this log is a ticket"]
+    adminprivate_log_type = _details_field(AdminprivateDetails, "adminprivate_log_type",
+                                           "Stores what kind of adminprivate log it is (None if not an adminprivate log)")
+    ticket_number = _details_field(AdminprivateDetails, "ticket_number", "Stores the ticket number, if this log is a ticket")
 
     def parse_game(self, log: str) -> None:  # noqa: C901
         """Parses a game log entry from `GAME:` onwards (GAME: should not be included)"""
         other = log
         if other.startswith("Gold Slime chemical mob spawn reaction occuring at"):
             agent = other.split("with last fingerprint ", 1)[-1]
-            self.agent = Player(agent.strip(), None)
+            self.agent = self._players.get(agent.strip(), None)
             loc_start = self.__parse_and_set_location(other)
             other, location_name = other[:loc_start].split("occuring at ", 1)
             self.location_name = location_name.strip()
@@ -300,7 +594,7 @@ class Log:
         if " relic used by " in other:
             self.admin_log_type = AdminLogType.OTHER
             agent, other = other.split(" relic used by ", 1)[-1].rsplit(" in ", 1)
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
             self.text = other.strip()
             loc_start = self.__parse_and_set_location(other)
             if loc_start > 0:
@@ -308,20 +602,20 @@ class Log:
             self.text = log[:20].strip()
             return
         if match := GAME_I_LOVE_BOMBS_REGEX.match(other):
-            self.agent = Player.parse_player(match[1])
+            self.agent = self._players.parse_player(match[1])
             self.text = other.strip()
             return
         if other.startswith("Blast wave primed by "):
             agent, location = other[21:].split(" fired from ", 1)
             location = location.split(" roughly towards ", 1)[0].strip()
-            self.agent = Player.parse_player(agent.strip())
+            self.agent = self._players.parse_player(agent.strip())
             loc_start = self.__parse_and_set_location(location)
             self.location_name = location[:loc_start].strip()
             self.text = other.strip()
             return
         if "rune activated by " in other:
             agent, location = other.split("rune activated by ", 1)[-1].split(" at ", 1)
-            self.agent = Player(None, agent.strip())
+            self.agent = self._players.get(None, agent.strip())
             loc_start = self.__parse_and_set_location(location)
             self.location_name = location[:loc_start].strip()
             self.text = other.strip()
@@ -329,7 +623,7 @@ class Log:
         if other.startswith("The station self-destruct terminal was armed"):
             other, location = other.split(" at (", 1)
             location, agent = location.split(") by ")
-            self.agent = Player.parse_player(agent.strip(". "))
+            self.agent = self._players.parse_player(agent.strip(". "))
             loc_start = self.__parse_and_set_location(location)
             self.location_name = location[:loc_start]
             return
@@ -338,7 +632,7 @@ class Log:
             if "emitter turned " in other:
                 other, player_and_loc = other.split(" by ", 1)
                 player_and_loc = player_and_loc.split(" in ", 1)
-                self.agent = Player.parse_player(player_and_loc[0])
+                self.agent = self._players.parse_player(player_and_loc[0])
                 self.location_name = player_and_loc[1].split(" (")[0].strip()
             elif "emitter lost power" in other:
                 self.location_name = other[:loc_start].split(" in ", 1)[-1].strip()
@@ -352,14 +646,14 @@ class Log:
                 self.location_name = other[:loc_start].split(" in ")[-1].strip()
             elif " on fire with " in other:
                 agent, patient = other.split(") set ", 1)
-                self.agent = Player.parse_player(agent.strip())
-                self.patient = Player.parse_player(patient.split(" on fire with ", 1)[0])
+                self.agent = self._players.parse_player(agent.strip())
+                self.patient = self._players.parse_player(patient.split(" on fire with ", 1)[0])
                 self.location_name = other[:loc_start].split(" at ", 1)[-1].strip()
                 self.text = other.strip()
                 return
             elif log.startswith("A projectile "):
                 other, agent = log.split(" held by ")
-                self.agent = Player.parse_player(agent.split(" at ")[0])
+                self.agent = self._players.parse_player(agent.split(" at ")[0])
                 self.text = other.strip()
                 return
             elif " fired a cannon in " in other:
@@ -373,26 +667,26 @@ class Log:
                 fingerprints = fingerprints[19:-1]
             fingerprints = fingerprints.lstrip()
             if "/(" in fingerprints:
-                self.agent = Player.parse_player(fingerprints)
+                self.agent = self._players.parse_player(fingerprints)
             elif fingerprints != "*null*":
-                self.agent = Player(fingerprints, None)
+                self.agent = self._players.get(fingerprints, None)
         if log.startswith("Bomb valve opened"):
             agent = log.split("- Last touched by: ")[1]
             match = HORRIBLE_HREF_REGEX.match(agent)
-            self.agent = Player(match[1], match[2])
+            self.agent = self._players.get(match[1], match[2])
         elif log.startswith("Lesser Gold Slime chemical mob spawn") or \
                 log.startswith("Friendly Gold Slime chemical mob spawn") or \
                 log.startswith("Life (hostile) chemical mob spawn reaction") or \
                 log.startswith("Life (friendly) chemical mob spawn reaction"):
             agent, fingerprints = log.split(" carried by ", 1)[1].split(" with last fingerprint ")
             if agent.startswith("*null*"):
-                self.agent = Player(fingerprints, None)
+                self.agent = self._players.get(fingerprints, None)
             else:
-                self.agent = Player.parse_player(agent)
+                self.agent = self._players.parse_player(agent)
         elif "ignited in" in other and " by " in other:
-            self.agent = Player.parse_player(other.split(" by ")[1].strip())
+            self.agent = self._players.parse_player(other.split(" by ")[1].strip())
         elif "/(" in other and ") " in other:
-            self.agent = Player.parse_player(other.split(") ", 1)[0])
+            self.agent = self._players.parse_player(other.split(") ", 1)[0])
         self.text = other.strip()
 
     def parse_topic(self, log: str) -> None:
@@ -403,20 +697,20 @@ class Log:
         """Parses a game log entry from `ACCESS:` onwards (ACCESS: should not be included)"""
         if log.startswith("Login: "):
             if "/(" in log:
-                self.agent = Player.parse_player(log[7:].split(" from ")[0])
+                self.agent = self._players.parse_player(log[7:].split(" from ")[0])
             else:
-                self.agent = Player(log[7:].split(" from ")[0], None)
+                self.agent = self._players.get(log[7:].split(" from ")[0], None)
         elif log.startswith("Mob Login: "):
             agent = log[11:].split(" was assigned to")[0]
             if "/(" in log:
-                self.agent = Player.parse_player(agent)
+                self.agent = self._players.parse_player(agent)
             else:
-                self.agent = Player(agent, None)
+                self.agent = self._players.get(agent, None)
         elif log.startswith("Logout: "):
             if "/(" in log:
-                self.agent = Player.parse_player(log[8:])
+                self.agent = self._players.parse_player(log[8:])
             else:
-                self.agent = Player(log[8:], None)
+                self.agent = self._players.get(log[8:], None)
         self.text = log.strip()
 
     # Another one of those overly-complex functions, but what can you do...
@@ -431,16 +725,16 @@ class Log:
             self.admin_log_type = AdminLogType.ANNOUNCE
             _, other = other.split(": ", 1)
             agent, other = other.split(") ", 1)
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
             self.text = other[1:].strip()  # Remove ':'
             return
         if other.startswith("SubtlePM: "):
             self.admin_log_type = AdminLogType.SUBTLE_MESSAGE
             _, other = other.split(": ", 1)
             agent, other = other.split(" -> ", 1)
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
             patient, other = other.split(") : ", 1)
-            self.patient = Player.parse_player(patient)
+            self.patient = self._players.parse_player(patient)
             self.text = other.strip()
             return
         if other.startswith("Chat Name Check: ") or other.startswith("<span class='boldnotice'>Roundstart logout report"):
@@ -450,7 +744,7 @@ class Log:
             self.admin_log_type = AdminLogType.BUILD_MODE
             _, other = other.split(": ", 1)
             agent, other = other.split(") ", 1)
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
             loc_start = self.__parse_and_set_location(other)
             if loc_start > 0:
                 if "modified the " in other:
@@ -475,16 +769,16 @@ class Log:
         if other.startswith("DirectNarrate: "):
             self.admin_log_type = AdminLogType.DIRECT_NARRATE
             agent, other = other[15:].split(" to ", 1)
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
             patient, other = other.split("): ", 1)
-            self.patient = Player.parse_player(patient)
+            self.patient = self._players.parse_player(patient)
             self.text = other.strip()
             return
         match = ADMIN_STAT_CHANGE_REGEX.search(other)
         if match:
             self.admin_log_type = AdminLogType.STATUS_CHANGE
             agent, other = other.split(match[0])
-            self.agent = Player(agent.strip(), None)
+            self.agent = self._players.get(agent.strip(), None)
             other = match[0] + other.rstrip('.')
             self.text = other.strip()
             return
@@ -498,32 +792,32 @@ class Log:
             return
         if other.endswith(" is trying to join, but needs to verify their ckey."):
             if "/(" in other:
-                self.agent = Player.parse_player(other.split(") ", 1)[0].strip())
+                self.agent = self._players.parse_player(other.split(") ", 1)[0].strip())
             else:
-                self.agent = Player(other.split(" ", 1)[0].strip(), None)
+                self.agent = self._players.get(other.split(" ", 1)[0].strip(), None)
             self.text = other.strip()
             return
         if " custom away mission" in other:
             other = other.replace("Admin ", "", 1)  # Because WHY WOULD IT BE UNIFORM
             agent, other = other.split(") ", 1)
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
             return
         if other.startswith("*null*"):
             self.text = other.strip()
             return
         if " has no jobs enabled, " in other:
-            self.agent = Player(other.split(" has no jobs enabled, ")[0], None)
+            self.agent = self._players.get(other.split(" has no jobs enabled, ")[0], None)
             self.text = other.strip()
             return
         if ") " in other:
             agent, other = other.split(") ", 1)
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
         if ADMIN_BUILD_MODE_REGEX.search(other):
             self.admin_log_type = AdminLogType.BUILD_MODE
         elif other.startswith("made the ") and ' say "' in other:
             self.admin_log_type = AdminLogType.OBJECT_SAY
             patient, other = other[9:].split(' at ', 1)
-            self.patient = Player(None, patient)
+            self.patient = self._players.get(None, patient)
             location_name, other = other.split(' say "')
             loc_start = self.__parse_and_set_location(location_name)
             if loc_start > 0:
@@ -539,7 +833,7 @@ class Log:
             # len("(reply to ") == 10
             other = other[10:]
             patient, other = other.split(") ", 1)
-            self.patient = Player.parse_player(patient)
+            self.patient = self._players.parse_player(patient)
             loc_start = self.__parse_and_set_location(other)
             if loc_start > 0:
                 self.location_name = other[:loc_start].split("(")[-1].strip()
@@ -550,18 +844,18 @@ class Log:
             self.admin_log_type = AdminLogType.SPAWN
         elif other.startswith("changed the equipment of "):
             self.admin_log_type = AdminLogType.EQUIPMENT
-            self.patient = Player.parse_player(other[25:])
+            self.patient = self._players.parse_player(other[25:])
         elif other.startswith("dealt ") and " to " in other:
             self.admin_log_type = AdminLogType.DAMAGE
-            self.patient = Player.parse_player(other.split(" to ", 1)[1].strip())
+            self.patient = self._players.parse_player(other.split(" to ", 1)[1].strip())
         elif other.startswith("commended "):
             self.admin_log_type = AdminLogType.COMMEND
-            self.patient = Player.parse_player(other[10:])
+            self.patient = self._players.parse_player(other[10:])
         elif other.startswith("has offered control of "):
             # len("has offered control of (" == 24
-            self.patient = Player.parse_player(other[24:].rsplit(")", 1)[0])
+            self.patient = self._players.parse_player(other[24:].rsplit(")", 1)[0])
         elif other.startswith("added a new objective for "):
-            self.patient = Player(other[26:].split(":", 1)[0], None)
+            self.patient = self._players.get(other[26:].split(":", 1)[0], None)
         elif other.startswith("played web sound"):
             self.admin_log_type = AdminLogType.PLAY_SOUND
         elif other.startswith("jumped to "):
@@ -574,32 +868,32 @@ class Log:
             self.admin_log_type = AdminLogType.TELEPORT
             # len("teleported ") == 11
             if " to " not in other:
-                self.patient = Player.parse_player(other[11:])
+                self.patient = self._players.parse_player(other[11:])
                 self.text = log.strip()
                 return
             patient, location = other[11:].split(" to ", 1)
-            self.patient = Player.parse_player(patient)
+            self.patient = self._players.parse_player(patient)
             loc_start = self.__parse_and_set_location(location)
             if loc_start > 0:
                 self.location_name = location[:loc_start].strip()
         elif other.startswith("has removed ") and "antagonist status" in other:
             self.admin_log_type = AdminLogType.ANTAG_PANEL
-            self.patient = Player.parse_player(other[other.index("antagonist status from ") + 23:])
+            self.patient = self._players.parse_player(other[other.index("antagonist status from ") + 23:])
         elif other.startswith("punished "):
             self.admin_log_type = AdminLogType.SMITE
             # Same as before
-            self.patient = Player.parse_player(other[9:])
+            self.patient = self._players.parse_player(other[9:])
         elif other.startswith("healed / Revived "):
             self.admin_log_type = AdminLogType.AHEAL
-            self.patient = Player.parse_player(other[17:])
+            self.patient = self._players.parse_player(other[17:])
         elif other.startswith("possessed a golem shell enslaved to"):
             # Same as before, 36 is the len
-            self.patient = Player.parse_player(other[36:])
+            self.patient = self._players.parse_player(other[36:])
         elif " player panel" in other:
             self.admin_log_type = AdminLogType.PLAYER_PANEL
             if "individual" in other and "*null*" not in other:
                 # Same again
-                patient = Player.parse_player(other[17:-1])
+                patient = self._players.parse_player(other[17:-1])
             return
         elif "checked antagonists" in other:
             self.admin_log_type = AdminLogType.ANTAG_PANEL
@@ -620,7 +914,7 @@ class Log:
         if other.startswith("ASAY: "):
             self.adminprivate_log_type = AdminprivateLogType.ASAY
             agent, other = other[6:].split(' "', 1)
-            self.agent = Player.parse_player(agent.strip())
+            self.agent = self._players.parse_player(agent.strip())
             other, location = other.split('" (', 1)
             loc_start = self.__parse_and_set_location(location)
             self.location_name = location[:loc_start].strip()
@@ -630,7 +924,7 @@ class Log:
             self.adminprivate_log_type = AdminprivateLogType.TICKET
             ticketno, agent, other = other[8:].split(": ", 2)
             self.ticket_number = int(ticketno)
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
             self.text = other.strip()
             return
         if other.startswith("PM: "):
@@ -639,9 +933,9 @@ class Log:
                 ticketno, other = other[12:].split(": ", 1)
                 self.ticket_number = int(ticketno)
             agent, other = other.split(")->", 1)
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
             patient, other = other.split("): ", 1)
-            self.patient = Player.parse_player(patient)
+            self.patient = self._players.parse_player(patient)
             self.text = other.strip()
             return
         if other.startswith("Ticket <A HREF"):
@@ -649,30 +943,30 @@ class Log:
             self.ticket_number = int(other[other.index("'>#")+3:end_of_ticket_id])
             start_of_agent = other.index(" by <")
             match = HORRIBLE_HREF_REGEX.match(other[start_of_agent+4:])
-            self.agent = Player(match[1], match[2])
+            self.agent = self._players.get(match[1], match[2])
             self.text = other[end_of_ticket_id + 5:start_of_agent]
             return
         if other.startswith("New interview created for "):
             self.adminprivate_log_type = AdminprivateLogType.INTERVIEW
             # Strip the startswith content and last dot
-            self.agent = Player.parse_player(other[26:-1])
+            self.agent = self._players.parse_player(other[26:-1])
         if "has passed the" in other and "filter" in other:
             self.adminprivate_log_type = AdminprivateLogType.FILTER
-            self.agent = Player.parse_player(other[:other.index(" has passed")])
+            self.agent = self._players.parse_player(other[:other.index(" has passed")])
         elif match := ADMINPRIVATE_NOTE_REGEX.match(other):
             self.adminprivate_log_type = AdminprivateLogType.NOTE
-            self.agent = Player.parse_player(match[1].strip())
-            self.patient = Player(match[4], None)
+            self.agent = self._players.parse_player(match[1].strip())
+            self.patient = self._players.get(match[4], None)
             self.text = f"{match[2]} a {match[3]}: {match[5]}"
             return
         elif match := ADMINPRIVATE_BAN_REGEX.match(other):
             self.adminprivate_log_type = AdminprivateLogType.BAN
-            self.agent = Player.parse_player(match[1].strip())
-            self.patient = Player(match[3], None)
+            self.agent = self._players.parse_player(match[1].strip())
+            self.patient = self._players.get(match[3], None)
             self.text = match[2].strip() + " from " + match[4]
             return
         elif other.startswith("Notice: Connecting player "):
-            self.agent = Player(other[26:].split(" has the same", 1)[0], None)
+            self.agent = self._players.get(other[26:].split(" has the same", 1)[0], None)
         elif other.startswith("ERROR: "):
             self.adminprivate_log_type = AdminprivateLogType.ERROR
         self.text = log.strip()
@@ -692,7 +986,7 @@ class Log:
     def parse_emote(self, log: str) -> None:
         """Parses a game log entry from `EMOTE:` onwards (EMOTE: should not be included)"""
         agent, other = log.split(") ", 1)  # Ensure that we didn't get a name with spaces
-        self.agent = Player.parse_player(agent)
+        self.agent = self._players.parse_player(agent)
         if " (" not in other:
             self.text = other.strip()
             return
@@ -717,11 +1011,11 @@ class Log:
                 player_agent = False
         if player_agent:
             agent, other = log.split(") ", 1)
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
         elif object_agent:
             agent, other = log.split("] ", 1)
             # Remove [, since the name usually looks like "[frag grenade] has ..."
-            self.agent = Player(None, agent[1:])
+            self.agent = self._players.get(None, agent[1:])
         else:
             # Just in case there's some strange log entry
             return
@@ -768,10 +1062,10 @@ class Log:
                     "is being pickpocketed of" in other or \
                     "is having the" in other:
                 patient = other.split(") ", 1)[0]
-                self.patient = Player.parse_player(patient)
+                self.patient = self._players.parse_player(patient)
             elif other.startswith("surgically removed") and "from" in other:
                 patient = other.split(" from ", 1)[1].split(") ", 1)[0]
-                self.patient = Player.parse_player(patient)
+                self.patient = self._players.parse_player(patient)
         # A large tuple... there is no better way, I thought for a long time
         # If you think of a better way, please PR it or make an issue report
 
@@ -840,7 +1134,7 @@ class Log:
         if parse_key and other_temp[0] != "[":
             patient = other_temp.split(") ", 1)[0]
             if "/(" in patient:
-                self.patient = Player.parse_player(patient)
+                self.patient = self._players.parse_player(patient)
             del other_temp
         # NOTE: surgery related logs were not added, as they are quite rare and I don't
         # think they'd contribute much. Feel free to add them yourself.
@@ -869,12 +1163,12 @@ class Log:
         else:
             self.silicon_log_type = SiliconLogType.MISC
         agent, other = log.split(") ", 1)
-        self.agent = Player.parse_player(agent)
+        self.agent = self._players.parse_player(agent)
 
         if self.silicon_log_type == SiliconLogType.LAW and other.startswith("used "):
             patient = other.split(" on ", 1)[1].split(") ", 1)[0]
             if not patient.startswith("*null*"):
-                self.patient = Player.parse_player(patient)
+                self.patient = self._players.parse_player(patient)
         self.text = other.strip()
         # NOTE: someone PLEASE fix logging this is getting ridiculous
         # NOTE: there is no reliable way of getting the second key here
@@ -882,7 +1176,7 @@ class Log:
     def parse_pda(self, log: str) -> None:
         """Parses a game log entry from `PDA:` onwards (PDA: should not be included)"""
         agent, other = log.split(") ", 1)
-        self.agent = Player.parse_player(agent)
+        self.agent = self._players.parse_player(agent)
         # Sending a message with the message monitor console adds a "sent " FOR NO PARTICULAR REASON
         # It gets better... it also moves " to "...
         if "PDA: message monitor console" in other or "Tablet: message monitor console" in other or\
@@ -907,7 +1201,7 @@ class Log:
                 text, location = other.split('" (', 1)
                 loc_start = self.__parse_and_set_location(location)
                 self.location_name = location[:loc_start].strip()
-        self.patient = Player(None, patient)
+        self.patient = self._players.get(None, patient)
         self.text = html_unescape(text.strip())
 
     def parse_mecha(self, log: str) -> None:
@@ -919,7 +1213,7 @@ class Log:
     def parse_paper(self, log: str) -> None:
         """Parses a game log entry from `PAPER:` onwards (PAPER: should not be included)"""
         agent, other = log.split(") ", 1)
-        self.agent = Player.parse_player(agent)
+        self.agent = self._players.parse_player(agent)
         self.text = other.strip()
 
     def parse_virus(self, log: str) -> None:
@@ -927,12 +1221,12 @@ class Log:
         m = VIRUS_CULTURE_PRINT_REGEX.match(log)
         if m:
             agent = log.split(") by ", 1)[1]
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
             self.virus_name, other = m[1].split(" sym:", 1)
             self.text = "printed, sym:" + other.strip()
         else:
             agent, other = VIRUS_INFECTED_OR_CURED_REGEX.split(log)
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
             if " sym:" not in other:
                 # Heart attacks my beloved...
                 self.text = other.strip()
@@ -953,9 +1247,9 @@ class Log:
         self.is_dead = False
         agent, other = log.split(" [", 1)
         if "/(" in agent:
-            self.agent = Player.parse_player(agent)
+            self.agent = self._players.parse_player(agent)
         else:
-            self.agent = Player(None, agent)
+            self.agent = self._players.get(None, agent)
         channel, other = other.split("] (", 1)
         self.telecomms_network = channel
         _spans, other = other.split(') "', 1)
@@ -968,7 +1262,7 @@ class Log:
     def parse_uplink(self, log: str) -> None:
         """Parses a game log entry from `UPLINK:` onwards (UPLINK: should not be included)"""
         agent, other = log.split(") ", 1)
-        self.agent = Player.parse_player(agent)
+        self.agent = self._players.parse_player(agent)
         self.text = html_unescape(other.strip())
         self.is_dead = False
         # Maybe in the future I could add a telecrystals variable, but I don't see a need
@@ -981,7 +1275,7 @@ class Log:
             return
 
         agent, other = log.split(") ", 1)
-        self.agent = Player.parse_player(agent)
+        self.agent = self._players.parse_player(agent)
         self.text = html_unescape(other.strip())
 
     def parse_tgui(self, log: str) -> None:
@@ -1009,7 +1303,7 @@ class Log:
                 # If the first branch ran, this should be empty. If it didn't then we have a ckey
                 # Logging is a giant mess
                 agent = f"{something}/(None)"
-        self.agent = Player.parse_player(agent)
+        self.agent = self._players.parse_player(agent)
 
         # Set text to 'Empty' if other is empty, since we're expecting
         # extra data (newlines will get appended)
@@ -1038,7 +1332,7 @@ class Log:
         """Parses a generic SAY log entry from SAY: onwards (includes SAY, WHISPER, OOC)
         (should only include line from SAY: onwards, without the SAY)"""
         agent, other = log.split(") ", 1)  # Ensure that we didn't get a name with spaces
-        self.agent = Player.parse_player(agent)
+        self.agent = self._players.parse_player(agent)
         # Priority announcements, yet another exception
         if other.startswith("(mob"):
             _, other = other.split(" ", 1)
@@ -1051,7 +1345,7 @@ class Log:
         if other.startswith("(Personality Commune"):
             patient = other[24:-1]
             if not patient != "*null*":
-                self.patient = Player(patient, None)
+                self.patient = self._players.get(patient, None)
             other += ' '
         text, other = other.split('" ', 1)  # Do not change this
         self.text = html_unescape(text.strip('"').replace('"', '| '))
@@ -1077,9 +1371,9 @@ class Log:
 
     def pretty(self):
         """Return, but with ANSI colour!"""
-        if self.raw_line[0] == "{":
-            return self.__pretty_json()
         to_be_printed = self.raw_line
+        if to_be_printed[0] == "{":
+            return self.__pretty_json()
         to_be_printed = LOG_PRETTY_LOC.sub(self.__re_pretty(LOG_COLOUR_PASTEL_CYAN), to_be_printed)
         to_be_printed = LOG_PRETTY_PATH.sub(self.__re_pretty(LOG_COLOUR_PASTEL_ORANGE), to_be_printed)
         to_be_printed = LOG_PRETTY_STR.sub(self.__re_pretty_htmlescaped(LOG_COLOUR_SUNSET), to_be_printed, 1)
@@ -1129,8 +1423,61 @@ class Log:
         return self.raw_line
 
 
+# These parsers always start with `agent, other = log.split(") ", 1)`, so lazy logs can get the agent cheaply
+_AGENT_FIRST_LOG_TYPES = {LogType.SAY, LogType.WHISPER, LogType.OOC, LogType.EMOTE, LogType.RADIOEMOTE,
+                          LogType.PDA, LogType.PAPER, LogType.UPLINK}
+# Fields that are left empty until they're first read when a log is loaded lazily
+_LAZY_FIELDS = frozenset(('agent', 'patient', 'location', 'location_name', 'text', 'is_dead', 'details'))
+# Lazy fields come last, agent first among them since it's sometimes parsed right away
+_PICKLED_FIELDS = ('json_schema', 'time', 'raw_line', 'log_type', 'logfile_pos',
+                   'agent', 'patient', 'location', 'location_name', 'text', 'is_dead', 'details')
+_get_pickled_fields = attrgetter(*_PICKLED_FIELDS)
+_get_eager_fields = attrgetter(*_PICKLED_FIELDS[:5])
+
+
+def _is_slot_set(slot, log: Log) -> bool:
+    """Checks if a slot has a value without triggering lazy parsing"""
+    try:
+        slot.__get__(log)  # pylint: disable=unnecessary-dunder-call
+    except AttributeError:
+        return False
+    return True
+
+
+def write_errored(errored: list[str]) -> None:
+    """Adds lines that couldn't be parsed to `ERRORED_FILE`, so they can be reported"""
+    if errored:
+        with open(ERRORED_FILE, 'a+', encoding="utf-8") as file:
+            file.write("## If you see this, please share it with Riggle.\n")
+            file.write("## ")
+            file.write(__version__)
+            file.write("\n\n")
+            file.writelines(line + "\n" for line in errored)
+
+
+def _build_category_parsers() -> dict[str, tuple[LogType, Optional[Callable[[Log, str], None]], bool]]:
+    """Maps every category we expect to see in a log line straight to its log type, parsing function and
+    whether the parser always takes the agent from the start of the line, so we don't have to work them out
+    for every single line"""
+    parsers = {}
+    for log_type in LogType:
+        entry = (log_type, getattr(Log, f"parse_{log_type.name.lower()}", None), log_type in _AGENT_FIRST_LOG_TYPES)
+        for category in (log_type.name, log_type.name.lower()):
+            parsers[category] = entry
+        # Old logs look like GAME-SAY, JSON logs like game-say
+        parsers[f"GAME-{log_type.name}"] = entry
+        parsers[f"game-{log_type.name.lower()}"] = entry
+    return parsers
+
+
+_CATEGORY_PARSERS = _build_category_parsers()
+# Used by logs that weren't given a registry, like the ones you make by hand. No LogFile owns it, so it's limited
+_DEFAULT_PLAYERS = PlayerRegistry(UNOWNED_REGISTRY_LIMIT)
+
+
 if __name__ == "__main__":
     single_log = Log(input())
     init()
     print(single_log.pretty())
-    print(single_log.__dict__)
+    print({name: getattr(single_log, name) for name in dir(single_log) if not name.startswith('_')
+           and not callable(getattr(single_log, name))})
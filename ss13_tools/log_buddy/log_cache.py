@@ -0,0 +1,177 @@
+"""Saves parsed logs in the user's cache folder, so opening the same file again doesn't parse it again.
+Caches are JSON, so a cache someone else made can't run any code, at worst it's thrown away"""
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from sys import intern
+from typing import Optional
+
+from ss13_tools.__version__ import __version__
+from ss13_tools.log_buddy.log import Log, LogType, Player, LogDetails, DamageType, SiliconLogType, AdminLogType, \
+    AdminprivateLogType
+from ss13_tools.log_buddy.constants import CACHE_FOLDER, CACHE_SUFFIX
+
+# Bump if the layout of the cache file changes
+CACHE_FORMAT_VERSION = 3
+# Changing any of these changes how logs are parsed (canonicalize shapes the ckeys that are saved)
+_PARSER_MODULES = (os.path.join("log_buddy", "log.py"), os.path.join("log_buddy", "log_parser.py"),
+                   os.path.join("log_buddy", "expressions.py"), os.path.join("log_buddy", "timestamps.py"),
+                   os.path.join("log_buddy", "constants.py"), os.path.join("byond", "key_tools.py"))
+# Enums that can be in log details, saved as [name of the enum, name of the member]
+_DETAIL_ENUMS = {enum.__name__: enum for enum in (DamageType, SiliconLogType, AdminLogType, AdminprivateLogType)}
+_DETAIL_TYPES = {details.__name__: details for details in LogDetails.__subclasses__()}
+
+
+@lru_cache(maxsize=1)
+def parser_version() -> str:
+    """Returns a string that changes whenever the parser changes"""
+    digest = hashlib.blake2b(__version__.encode("utf-8"), digest_size=16)
+    folder = os.path.dirname(os.path.dirname(__file__))
+    for module in _PARSER_MODULES:
+        try:
+            with open(os.path.join(folder, module), "rb") as file:
+                digest.update(file.read())
+        except OSError:
+            # Bundled with pyinstaller, there's no source. The version will have to do
+            pass
+    return digest.hexdigest()
+
+
+def file_digest(filename: str) -> str:
+    """Returns the hash of the file's contents"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as file:
+        # hashlib.file_digest would do this, but it's only in Python 3.11+
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_folder() -> str:
+    """Returns the folder caches are saved in, it's the user's own"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+    elif sys.platform == "darwin":
+        base = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+    return os.path.join(base, CACHE_FOLDER)
+
+
+def cache_path(filename: str, lazy: bool = False) -> str:
+    """Returns where the cache of a log file is saved. Named after a hash of the file's full path,
+    so files with the same name in different folders don't share one. Lazily loaded logs have their own,
+    logs that weren't parsed fully can't stand in for ones that were"""
+    key = os.path.normcase(os.path.realpath(filename)) + ("\0lazy" if lazy else "")
+    return os.path.join(cache_folder(), hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest() + CACHE_SUFFIX)
+
+
+def load(filename: str, lazy: bool = False) -> Optional[tuple[list[Log], Optional[set[str]]]]:
+    """Returns the logs and connected ckeys saved for `filename` (loaded lazily or not), or None if there's
+    no cache or it's outdated. Connected ckeys are None if the logs were loaded lazily"""
+    try:
+        stat = os.stat(filename)
+        with open(cache_path(filename, lazy), "r", encoding="utf-8") as file:
+            # The header is on the first line, so we can check it without reading all the logs
+            if not _is_valid(json.loads(file.readline()), filename, stat):
+                return None
+            cached = json.load(file)
+        players = [_decode_player(player) for player in cached["players"]]
+        logs = [_decode_log(fields, players) for fields in cached["logs"]]
+        return logs, None if cached["who"] is None else set(cached["who"])
+    except (OSError, ValueError, KeyError, IndexError, TypeError):
+        # Missing, half written, or not a cache at all. Either way, parse again
+        return None
+
+
+def save(filename: str, logs: list[Log], who: Optional[set[str]], lazy: bool = False) -> None:
+    """Saves parsed logs of `filename`, and whether they were loaded lazily. Does nothing if the cache can't
+    be written (for example a read only folder)"""
+    path = cache_path(filename, lazy)
+    temporary_path = path + ".tmp"
+    try:
+        stat = os.stat(filename)
+        header = {
+            "format": CACHE_FORMAT_VERSION,
+            "parser": parser_version(),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "digest": file_digest(filename),
+        }
+        players = {}
+        encoded = [_encode_log(log, players) for log in logs]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(json.dumps(header))
+            file.write("\n")
+            json.dump({
+                "players": [[player.key, player.ckey, player.mob_name] for player in players],
+                "logs": encoded,
+                "who": None if who is None else sorted(who),
+            }, file, separators=(",", ":"))
+        # So nobody ever reads a half written cache
+        os.replace(temporary_path, path)
+    except OSError:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+
+
+def _is_valid(header: dict, filename: str, stat: os.stat_result) -> bool:
+    """Checks if a cache header still matches the file and the parser"""
+    if not isinstance(header, dict) or header.get("format") != CACHE_FORMAT_VERSION \
+            or header.get("parser") != parser_version() or header.get("size") != stat.st_size:
+        return False
+    if header.get("mtime") == stat.st_mtime_ns:
+        return True
+    # Touched, or downloaded again. Might still be the same file
+    return header.get("digest") == file_digest(filename)
+
+
+def _encode_log(log: Log, players: dict[Player, int]) -> list:
+    """Turns a log into a list JSON can save, see `Log._fields`. Players are saved once, `players` gets
+    the index of each one"""
+    fields = list(log._fields())  # pylint: disable=protected-access
+    fields[1] = fields[1].isoformat() if fields[1] else None
+    fields[3] = fields[3].name if fields[3] else None
+    # Agent and patient, if they were parsed
+    for index in range(5, min(len(fields), 7)):
+        if fields[index] is not None:
+            fields[index] = players.setdefault(fields[index], len(players))
+    if len(fields) > 11 and fields[11] is not None:
+        details = fields[11]
+        fields[11] = [type(details).__name__, [[type(value).__name__, value.name] if isinstance(value, Enum) else value
+                                               for value in map(details.__getattribute__, details.__slots__)]]
+    return fields
+
+
+def _decode_log(fields: list, players: list[Player]) -> Log:
+    """Counterpart to `_encode_log`"""
+    fields[1] = datetime.fromisoformat(fields[1]) if fields[1] else None
+    fields[3] = LogType[fields[3]] if fields[3] else None
+    for index in range(5, min(len(fields), 7)):
+        if fields[index] is not None:
+            fields[index] = players[fields[index]]
+    if len(fields) > 7:
+        if fields[7] is not None:
+            fields[7] = tuple(fields[7])
+        if fields[8] is not None:
+            fields[8] = intern(fields[8])
+        if fields[11] is not None:
+            name, values = fields[11]
+            details = fields[11] = _DETAIL_TYPES[name]()
+            for slot, value in zip(details.__slots__, values):
+                setattr(details, slot, _DETAIL_ENUMS[value[0]][value[1]] if isinstance(value, list) else value)
+    return Log._unpickle(tuple(fields))  # pylint: disable=protected-access
+
+
+def _decode_player(fields: list) -> Player:
+    """Makes a player that was saved as [key, ckey, mob name], without parsing it again"""
+    player = Player.__new__(Player)
+    player.key, player.ckey, player.mob_name = (intern(field) if field else field for field in fields)
+    return player
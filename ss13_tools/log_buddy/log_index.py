@@ -0,0 +1,42 @@
+"""Base for the indexes that find logs without going through all of them"""
+from typing import Annotated
+
+from .log import Log
+
+
+class LogIndex:
+    """Something worked out from a list of logs, pointing at them by their position in the list.
+
+    The index doesn't follow changes to the list. `LogFile` counts every time its logs move in `generation`,
+    and an index is only current if it's of the same list, at the same generation, with the same number of
+    logs. Logs added to the end of the list (nothing moves) can be taken in with `extend`.
+
+    Subclasses index logs in `_add`.
+
+    Parameters:
+    `logs` (list[Log]): logs to index
+    `generation` (int): `LogFile.generation` of the logs (0 by default)
+    """
+    __slots__ = ('logs', 'size', 'generation')
+
+    logs: Annotated[list[Log], "The indexed logs"]
+    size: Annotated[int, "How many logs there were when they were indexed"]
+    generation: Annotated[int, "`LogFile.generation` of the logs when they were indexed"]
+
+    def __init__(self, logs: list[Log], generation: int = 0) -> None:
+        self.logs = logs
+        self.size = 0
+        self.generation = generation
+
+    def is_current(self, logs: list[Log], generation: int = 0) -> bool:
+        """Is this still an index of `logs`, at `generation`?"""
+        return self.logs is logs and self.generation == generation and self.size == len(logs)
+
+    def extend(self) -> None:
+        """Indexes the logs that were added to the end of the list since it was indexed"""
+        self._add(self.logs[self.size:], self.size)
+        self.size = len(self.logs)
+
+    def _add(self, logs: list[Log], start: int) -> None:
+        """Indexes `logs`, which are at positions from `start` in the list"""
+        raise NotImplementedError
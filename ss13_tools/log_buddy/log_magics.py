@@ -12,6 +12,8 @@ from pyperclip import copy
 from ..byond import canonicalize
 from .log_parser import LogFile, SHAMELESS
 from .log import LogType
+from .constants import FOLLOW_INTERVAL
+from .undo_history import UndoHistory
 
 
 LOGS_VARIABLE_NAME = 'logs'
@@ -27,8 +29,9 @@ class LogMagics(Magics):
         @wraps(func)
         def decorator_undoable(self, arg):
             """You should not be seeing this"""
+            before, generation = self.logs_var.logs, self.logs_var.generation
             func(self, arg)  # pylint: disable=not-callable
-            self.actions.append((func.__name__, arg))  # pylint: disable=no-member
+            self.history.record(f"%{func.__name__} {arg}", before, generation)  # pylint: disable=no-member
         return decorator_undoable
 
     @property
@@ -49,6 +52,7 @@ class LogMagics(Magics):
             - p: only get the round the person played in? (applies only for ckeys)
             - r: the amount of rounds to download (applies only for ckeys)
             - f: pre-emptively delete all logs without our target ckey (applies only for ckeys)
+            - l: parse most of each log only when it's first used, loads a lot faster
         - `%download 198563`: download round 198563
         - `%dl 198563`: same as above
         - `%download 199563-199999`: download rounds 199500 to 199600 (inclusive). Be careful with this,
@@ -62,10 +66,12 @@ class LogMagics(Magics):
         - `%download -c -r=10 123123123` you can have more than one switch! The `=` is optional
         - `%download -cr=10 123123123` you can group options like this! The `=` is optional. Just remember
         to have the number right next to the character (r). Doing `-rc10` would assign 10 to c (error)
+        - `%download -l 199563-199999` loads the rounds lazily
         """
         if not parameter_s:
             raise UsageError(f"No arguments! Usage:\n{self.download.__doc__}")
-        opts, args = self.parse_options(parameter_s, 'cpr:f')
+        opts, args = self.parse_options(parameter_s, 'cpr:fl')
+        lazy = 'l' in opts
         if 'c' not in opts and '-' in args:
             args = args.split('-')
             if len(args) != 2:
@@ -74,7 +80,7 @@ class LogMagics(Magics):
                 first, last = (int(x) for x in args)
             except ValueError as ex:
                 raise UsageError("One of these is not a number, try again") from ex
-            self.logs_var = LogFile.from_round_range(first, last)
+            self.logs_var = LogFile.from_round_range(first, last, lazy=lazy)
             return
         if 'c' not in opts and ' ' in args or ',' in args:
             # Split with spaces and commas
@@ -84,16 +90,17 @@ class LogMagics(Magics):
                 round_ids = tuple(int(x) for x in args if x)
             except ValueError as ex:
                 raise UsageError("One of those is not a number, please try again") from ex
-            self.logs_var = LogFile.from_round_collection(*round_ids)
+            self.logs_var = LogFile.from_round_collection(*round_ids, lazy=lazy)
             return
         if 'c' not in opts and args.isnumeric():
-            self.logs_var = LogFile.from_round_id(int(args))
+            self.logs_var = LogFile.from_round_id(int(args), lazy=lazy)
         else:
             rounds = int(opts['r'].lstrip('=')) if 'r' in opts else 50
             filter_logs = 'f' in opts
             only_played = 'p' in opts
             args = canonicalize(args)
-            self.logs_var = LogFile.from_ckey(args, rounds=rounds, only_played=only_played, filter_logs=filter_logs)
+            self.logs_var = LogFile.from_ckey(args, rounds=rounds, only_played=only_played, filter_logs=filter_logs,
+                                              lazy=lazy)
 
     @line_magic
     def length(self, parameter_s=''):
@@ -120,7 +127,8 @@ class LogMagics(Magics):
         parameter_s = tuple(canonicalize(x) for x in re.split(r'[, ]', parameter_s) if x)
         print("Looking for", ', '.join(parameter_s))
         for ckey in parameter_s:
-            if ckey not in self.logs_var.who:
+            # The filter needs the index anyway, `who` would parse lazily loaded logs just for this
+            if ckey not in self.logs_var.ckey_index:
                 print(f"{ckey} not found! Ignoring!")
         self.logs_var.filter_ckeys(*parameter_s, source_only=False)
 
@@ -159,6 +167,17 @@ class LogMagics(Magics):
               "ON" if case_s else "OFF,", "and raw mode is", "ON" if additive else "OFF")
         self.logs_var.filter_strings(*args, case_sensitive=case_s, additive=additive)
 
+    @line_magic
+    def index_strings(self, parameter_s=''):
+        """Toggles the string index. When it's on, `%string` builds a trigram index of all logs the first time
+        (it takes a while and uses a lot of memory), then every search after that is much faster
+
+        Example:
+            - `%index_strings`
+        """
+        self.logs_var.index_strings = not self.logs_var.index_strings
+        print("String index is", "ON" if self.logs_var.index_strings else "OFF")
+
     @_undoable
     @line_magic
     def heard(self, parameter_s=''):
@@ -173,7 +192,7 @@ class LogMagics(Magics):
         parameter_s = tuple(canonicalize(x) for x in re.split(r'[, ]', parameter_s) if x)
         print("Looking for", ', '.join(parameter_s))
         for ckey in parameter_s:
-            if ckey not in self.logs_var.who:
+            if ckey not in self.logs_var.ckey_index:
                 print(f"{ckey} not found! Ignoring!")
         self.logs_var.filter_heard(*parameter_s)
 
@@ -192,7 +211,7 @@ class LogMagics(Magics):
         parameter_s = tuple(canonicalize(x) for x in re.split(r'[, ]', parameter_s) if x)
         print("Filtering conversation on ckeys", ', '.join(parameter_s))
         for ckey in parameter_s:
-            if ckey not in self.logs_var.who:
+            if ckey not in self.logs_var.ckey_index:
                 print(f"{ckey} not found! Ignoring!")
         self.logs_var.filter_conversation(*parameter_s)
 
@@ -203,7 +222,26 @@ class LogMagics(Magics):
         Example:
             - `%who`
         """
-        print(self.logs_var.who)
+        print(sorted(self.logs_var.who))
+
+    @line_magic
+    def parse_stats(self, parameter_s=''):
+        """Show how long each type of log took to parse, and the slowest lines. With a file name, parses
+        that file just to measure it (it's not added to the logs)
+
+        Example:
+            - `%parse_stats`
+            - `%parse_stats game.txt`
+        """
+        if parameter_s:
+            if not os.path.exists(parameter_s):
+                raise UsageError("File does not exist")
+            stats = LogFile.from_file(parameter_s, quiet=True, profile=True).parse_stats
+        else:
+            stats = self.logs_var.parse_stats
+        if stats is None:
+            raise UsageError("Parse statistics weren't recorded for these logs, give me a file to measure")
+        print(stats)
 
     @line_magic
     def list_locations(self, parameter_s=''):
@@ -218,7 +256,7 @@ class LogMagics(Magics):
     def reset(self, parameter_s=''):
         """Resets the work set"""
         self.logs_var.reset_work_set()
-        self.actions.clear()
+        self.history.clear()
         print("Filters reset!")
 
     @_undoable
@@ -278,6 +316,28 @@ class LogMagics(Magics):
         print("Excluding:", ', '.join(str(x) for x in exclude))
         self.logs_var.filter_by_type(include=include, exclude=exclude)
 
+    @_undoable
+    @line_magic
+    def time(self, parameter_s=''):
+        """Filters by time. Give a start and an end (both included), use - to leave one out.
+        Times can be full timestamps (in quotes if they have a space) or just the time of day
+
+        Example:
+            - `%time 12:00 12:02`
+            - `%time 12:30`: everything from 12:30 on
+            - `%time - 12:30`: everything until 12:30
+            - `%time "2023-03-01 23:58" "2023-03-02 00:03"`
+        """
+        args = parse_quoted_string(parameter_s)
+        if not args or len(args) > 2:
+            raise UsageError(f"Give me a start and an end! Usage:\n{self.time.__doc__}")
+        start, end = (None if arg == "-" else arg for arg in (args + ["-"])[:2])
+        print("Filtering from", start or "the start", "until", end or "the end")
+        try:
+            self.logs_var.filter_by_time(start, end)
+        except ValueError as ex:
+            raise UsageError("I don't understand that time, try something like 12:00 or 2023-03-01 12:00:00") from ex
+
     @line_magic
     def print_logs(self, parameter_s=''):
         """Prints our filtered logs
@@ -286,17 +346,19 @@ class LogMagics(Magics):
             - a: also print lines after (default 0)
             - b: also print lines before (default 0)
             - c: also print lines before and after (default 0)
+            - s: also print everything that happened this many seconds before and after (default 0)
             - f: skip max logs check, do not use pager
         """
-        opts, _ = self.parse_options(parameter_s, 'a:b:c:f')  # No d and e for now
+        opts, _ = self.parse_options(parameter_s, 'a:b:c:s:f')  # No d and e for now
         after = int(opts['a'].lstrip('=')) if 'a' in opts else 0
         before = int(opts['b'].lstrip('=')) if 'b' in opts else 0
         context = int(opts['c'].lstrip('=')) if 'c' in opts else 0
+        seconds = float(opts['s'].lstrip('=')) if 's' in opts else 0
         if 'f' not in opts and len(self.logs_var.logs) > 200:
             page("Too many logs, opening pager. Press q to quit, enter to advance one line, space to advance a screen\n" +
                  '\n'.join(log.pretty() for log in self.logs_var.logs) + '\n')
         else:
-            self.logs_var.print_working(after=after, before=before, context=context)
+            self.logs_var.print_working(after=after, before=before, context=context, seconds=seconds)
 
     @line_magic
     def head(self, parameter_s=''):
@@ -326,7 +388,7 @@ class LogMagics(Magics):
             print("Cancelled")
             return
         self.logs_var = LogFile()
-        self.actions.clear()
+        self.history.clear()
         print("Logs cleared!")
 
     @line_magic
@@ -339,39 +401,106 @@ class LogMagics(Magics):
 
     @line_magic
     def load_logs(self, parameter_s=''):
-        """Opens the file and adds all logs to our current collection"""
+        """Opens the file and adds all logs to our current collection
+
+        - Options:
+            - l: parse most of each log only when it's first used, loads a lot faster
+        - `%load_logs logs.txt`
+        - `%load_logs -l logs.txt`
+        """
         if not parameter_s:
             print("Enter a file name!")
-        if not os.path.exists(parameter_s):
+        opts, filename = self.parse_options(parameter_s, 'l')
+        if not os.path.exists(filename):
             raise UsageError("File does not exist")
-        print("Loading from", parameter_s)
-        self.logs_var.collate(LogFile.from_file(parameter_s))
+        print("Loading from", filename)
+        self.logs_var.collate(LogFile.from_file(filename, lazy='l' in opts))
 
-    actions = []
+    @line_magic
+    def follow(self, parameter_s=''):
+        """Follows a log file that's still being written (like during a round): adds new logs as they're written
+        and prints the ones that go into the work set, until you press Ctrl+C. Without -c or -s, new logs only
+        go into the work set if nothing is filtered out
+
+        Options:
+            - e: skip what's in the file now, use it if you loaded the file already
+            - i: how many seconds to wait before looking for new logs again (default 2)
+            - c: only new logs with these ckeys go into the work set
+            - s: only new logs containing this string go into the work set
+
+        Example:
+            - `%follow game.log`
+            - `%follow -e -i 5 game.log`
+            - `%follow -c ckey1,ckey2 -s help game.log`
+        """
+        opts, args = self.parse_options(parameter_s, 'ei:c:s:')
+        if not args:
+            raise UsageError(f"Enter a file name! Usage:\n{self.follow.__doc__}")
+        if not os.path.exists(args):
+            raise UsageError("File does not exist")
+        try:
+            interval = float(opts['i'].lstrip('=')) if 'i' in opts else FOLLOW_INTERVAL
+        except ValueError as ex:
+            raise UsageError("That's not a number of seconds!") from ex
+        ckeys = tuple(canonicalize(x) for x in re.split(r'[, ]', opts['c']) if x) if 'c' in opts else ()
+        string = opts['s'] if 's' in opts else None
+
+        def query(logs_query):
+            if ckeys:
+                logs_query.ckey(*ckeys)
+            if string:
+                logs_query.string(string)
+            return logs_query
+        follower = self.logs_var.follow(args, query if ckeys or string else None, from_end='e' in opts)
+        print(f"Following {args}, press Ctrl+C to stop")
+        follower.follow(interval)
+
+    # Work sets from before each filter. Set `LogMagics.history.memory_limit` to keep more (or less) of them
+    history = UndoHistory()
 
     @line_magic
     def undo(self, parameter_s=''):
         """Undo an action! Provide a number to undo multiple times"""
-        if not self.actions:
+        if not self.history.undo_stack:
             print("Nothing to undo!")
             return
+        times = self.__parse_times(parameter_s, len(self.history.undo_stack), "undo")
+        # Latest first
+        descriptions = [self.history.undo_stack[-i].description for i in range(1, times + 1)]
+        work_set = self.history.undo(self.logs_var.logs, self.logs_var.unfiltered_logs, self.logs_var.generation, times)
+        if work_set is None:
+            raise UsageError("Logs were loaded or sorted since then, so I can't undo anymore")
+        self.logs_var.logs = work_set
+        for description in descriptions:
+            print("Undid", description)
+
+    @line_magic
+    def redo(self, parameter_s=''):
+        """Redo an action you undid! Provide a number to redo multiple times"""
+        if not self.history.redo_stack:
+            print("Nothing to redo!")
+            return
+        times = self.__parse_times(parameter_s, len(self.history.redo_stack), "redo")
+        # Latest first
+        descriptions = [self.history.redo_stack[-i].description for i in range(1, times + 1)]
+        work_set = self.history.redo(self.logs_var.logs, self.logs_var.unfiltered_logs, self.logs_var.generation, times)
+        if work_set is None:
+            raise UsageError("Logs were loaded or sorted since then, so I can't redo anymore")
+        self.logs_var.logs = work_set
+        for description in descriptions:
+            print("Redid", description)
+
+    @staticmethod
+    def __parse_times(parameter_s: str, available: int, action: str) -> int:
+        """Returns how many times to undo or redo"""
         if parameter_s and not parameter_s.isnumeric():
             raise UsageError("That's not a number! Run it without one, or provide a number please")
-        undo_times = int(parameter_s) if parameter_s else 1
-        if undo_times < 1:
-            raise UsageError("What the hell? I can't undo less than 1 time...")
-        if len(self.actions) < undo_times:
-            raise UsageError("Cannot undo that many times!")
-        actions = self.actions.copy()[:-undo_times]
-
-        print("Rewinding...")
-        self.logs_var.reset_work_set()
-        for magic, params in actions:
-            print(f"Running %{magic} with params: {params}")
-            self.shell.run_line_magic(magic, params)
-        self.actions.clear()
-        self.actions = actions
-        print("Restored")
+        times = int(parameter_s) if parameter_s else 1
+        if times < 1:
+            raise UsageError(f"What the hell? I can't {action} less than 1 time...")
+        if available < times:
+            raise UsageError(f"Cannot {action} that many times!")
+        return times
 
     @line_magic
     def clip(self, parameter_s=''):
@@ -2,18 +2,39 @@
 from __future__ import annotations
 
 import asyncio
+import gc
+import operator
 import os
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 import traceback
-from typing import Annotated, Iterable, Union, Literal
+from contextlib import contextmanager
+from datetime import datetime, time as time_of_day, timedelta
+from typing import Annotated, Callable, Iterable, Iterator, Union, Literal
 from html import unescape as html_unescape
-from itertools import repeat, chain
+from itertools import repeat, chain, compress
+from time import perf_counter
 
 from tqdm import tqdm
 
-from .log import Log, LogType
-from .constants import ALL_LOGS_WE_PARSE, ERRORED_FILE, SHAMELESS
-from ..__version__ import __version__
+from . import log_cache
+from .log import Log, LogType, PlayerRegistry, write_errored
+from .log_source import MappedLogSource
+from .ckey_index import CkeyIndex
+from .string_matcher import StringMatcher
+from .trigram_index import TrigramIndex
+from .spatial_index import SpatialIndex
+from .hearing import HearingEngine
+from .log_index import LogIndex
+from .time_index import TimeIndex
+from .working_set import WorkingSet
+from .query import Query
+from .follower import LogFollower
+from .timestamps import decode_timestamp
+from .parse_stats import ParseStats
+from .constants import ALL_LOGS_WE_PARSE, SHAMELESS, PARALLEL_CHUNKS_PER_PROCESS, \
+    PARALLEL_MIN_CHUNK_SIZE, UNOWNED_REGISTRY_LIMIT
+from ..byond import canonicalize
 from ..log_downloader import RoundLogDownloader, RoundListLogDownloader, CkeyLogDownloader
 from ..scrubby import get_round_source_url
 
@@ -21,6 +42,18 @@ from ..scrubby import get_round_source_url
 HEARING_RANGE = 9
 
 
+@contextmanager
+def _paused_gc():
+    """Unpickling millions of logs makes the garbage collector run over and over for nothing"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
 class NotSortableException(Exception):
     """Hey, I can't sort this!"""
 
@@ -68,12 +101,16 @@ class LogFileType(Enum):
 
 class LogFile:
     """An object representing a log file. Most functions use `self.work_set`, original logs sorted in `self.logs`.
+The work set (`self.logs`) is a `WorkingSet`, a bitmap of which of `self.unfiltered_logs` are in it.
 
     Parameters:
     `logs` (list[str]): list of log lines
     `type` (LogFileType): type of the log file
     `verbose` (bool): toggles verbose mode
     `quiet` (bool): toggles quiet mode
+    `lazy` (bool): only parse the time, type and agent of each log when loading, the rest is parsed when first used
+    `processes` (int): how many processes to parse with. Only worth it for big files
+    `profile` (bool): record how long each type of log takes to parse, see `parse_stats`
 
     Examples:
 
@@ -83,89 +120,310 @@ class LogFile:
 
     `log_file = LogFile(["logline 1", "log line 2", "log line 3"])\
     # NOTE: must be a valid log or the parser will raise an exception`
+
+    `with LogFile(MappedLogSource("game.log")) as log_file: ...` # Closes the mapped file when done, see `close`
     """
     round_id: Annotated[int, "Stores the round ID. If unknown, it will equal -1"]
     unfiltered_logs: Annotated[list[Log], "Stores a list of all logs"]
-    logs: Annotated[list[Log], "Stores a list of filtered logs"]
-    who: Annotated[list[str], "Stores a list of all connected ckeys"]
+    _work_set: Annotated[WorkingSet, "Which logs are in the work set, see `logs`"]
     sortable: bool
     log_source: Annotated[str, "Source of the logs (if available)"]
+    lazy: Annotated[bool, "Are logs parsed only when they're used?"]
+    players: Annotated[PlayerRegistry, "Players seen in this file, shared between its logs"]
+    parse_stats: Annotated[Union[ParseStats, None], "Parse statistics for each log type, None if not profiling"]
+    index_strings: Annotated[bool, "Should `filter_strings` build and use a trigram index? See `string_index`"]
+    generation: Annotated[int, "Goes up every time logs in `unfiltered_logs` move, so indexes know they're outdated"]
+    sources: Annotated[list[MappedLogSource], "Mapped files the logs read their lines from, see `close`"]
 
     def __init__(self, logs: Iterable[str] = None, log_type: LogFileType = LogFileType.UNKNOWN,
-                 verbose: bool = False, quiet: bool = False) -> None:
+                 verbose: bool = False, quiet: bool = False, lazy: bool = False, processes: int = 1,
+                 profile: bool = False) -> None:
         if verbose and quiet:
             print("Really? You want me to be silent and verbose? Those are mutually exclusive you know")
         self.round_id = -1
         self.unfiltered_logs = []
-        self.logs = []
-        self.who = []
+        self._work_set = WorkingSet(self.unfiltered_logs)
+        self._who = set()
+        # Lazy logs we didn't get the agent of yet, since that could mean parsing them
+        self._who_pending = []
         self.sortable = True
         self.log_type = log_type
         self.log_source = None
+        self.lazy = lazy
+        self.players = PlayerRegistry()
+        self.parse_stats = ParseStats() if profile else None
+        self._ckey_index = None
+        self.index_strings = False
+        self._string_index = None
+        self._spatial_index = None
+        self._hearing = None
+        self._time_index = None
+        self.generation = 0
+        self.sources = []
 
         if not logs:
             return
+        if isinstance(logs, MappedLogSource):
+            self.sources.append(logs)
 
-        self.__parse_logs(logs, verbose=verbose, quiet=quiet)
+        if processes > 1 and not isinstance(logs, MappedLogSource):
+            self.__parse_logs_parallel(logs, processes, verbose=verbose, quiet=quiet)
+        else:
+            self.__parse_logs(logs, verbose=verbose, quiet=quiet)
         self.unfiltered_logs.sort(key=lambda log: log.time)
-        self.logs = self.unfiltered_logs
+        # Lines aren't always in order, like in files that were downloaded and put together
+        self.__renumber()
+        self.reset_work_set()
+
+    @property
+    def logs(self) -> WorkingSet:
+        """The work set: the filtered logs, in the same order as `unfiltered_logs`. Can be set to
+        a `WorkingSet` of `unfiltered_logs` or to any logs from it"""
+        return self._work_set
+
+    @logs.setter
+    def logs(self, value: Union[WorkingSet, Iterable[Log]]) -> None:
+        if isinstance(value, WorkingSet) and value.logs is self.unfiltered_logs:
+            self._work_set = value
+            return
+        # Logs that aren't in `unfiltered_logs` can't be in the work set
+        positions = {id(log): position for position, log in enumerate(self.unfiltered_logs)}
+        self._work_set = WorkingSet.from_positions(
+            self.unfiltered_logs, (positions[id(log)] for log in value if id(log) in positions))
+
+    def __select(self, positions: Union[Iterable[int], range]) -> WorkingSet:
+        """Returns the logs of the work set that are at these positions in `unfiltered_logs`"""
+        if isinstance(positions, range) and positions.step == 1:
+            return self.logs & WorkingSet.from_range(self.unfiltered_logs, positions)
+        return self.logs & WorkingSet.from_positions(self.unfiltered_logs, positions)
+
+    @property
+    def who(self) -> set[str]:
+        """Stores a set of all connected ckeys"""
+        if self._who_pending:
+            for log in self._who_pending:
+                if log.agent and log.agent.ckey:
+                    self._who.add(log.agent.ckey)
+            self._who_pending = []
+        return self._who
+
+    @who.setter
+    def who(self, value: set[str]) -> None:
+        self._who = value
+        self._who_pending = []
+
+    def __index(self, attr: str, factory: Callable[[], LogIndex]) -> LogIndex:
+        """Returns the index saved in `attr`, made with `factory` if there isn't one or it's outdated"""
+        index = getattr(self, attr)
+        if index is None or not index.is_current(self.unfiltered_logs, self.generation):
+            index = factory()
+            setattr(self, attr, index)
+        return index
+
+    @property
+    def ckey_index(self) -> CkeyIndex:
+        """Index of where each ckey shows up in `unfiltered_logs`, built the first time it's needed"""
+        return self.__index("_ckey_index", lambda: CkeyIndex(self.unfiltered_logs, self.generation))
+
+    @property
+    def string_index(self) -> TrigramIndex:
+        """Trigram index of `unfiltered_logs`, built the first time it's needed. Slow to build and big,
+        it's only used by `filter_strings` if `index_strings` is set"""
+        return self.__index("_string_index", self.__build_string_index)
+
+    def __build_string_index(self) -> TrigramIndex:
+        index = TrigramIndex(self.unfiltered_logs, self.generation)
+        print(index.report())
+        return index
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """Index of where each log in `unfiltered_logs` happened, built the first time it's needed"""
+        return self.__index("_spatial_index", lambda: SpatialIndex(self.unfiltered_logs, generation=self.generation))
+
+    @property
+    def hearing(self) -> HearingEngine:
+        """Works out what players could have heard in `unfiltered_logs`, made the first time it's needed"""
+        return self.__index("_hearing", lambda: HearingEngine(self.unfiltered_logs, self.ckey_index, self.generation))
+
+    @property
+    def time_index(self) -> TimeIndex:
+        """Index of when each log in `unfiltered_logs` happened, built the first time it's needed. The logs are
+        sorted first if they aren't (raises `NotSortableException` if they can't be)"""
+        return self.__index("_time_index", self.__build_time_index)
+
+    def __build_time_index(self) -> TimeIndex:
+        # The index finds times with a binary search, which gives wrong ranges if the logs aren't sorted
+        # (like after `add_log(..., sort=False)`)
+        self.sort()
+        return TimeIndex(self.unfiltered_logs, self.generation)
+
+    def __drop_indexes(self, keep_time_index: bool = False) -> None:
+        """Logs moved: forgets the indexes of `unfiltered_logs`, they'll be built again when needed"""
+        self.generation += 1
+        self._ckey_index = None
+        self._string_index = None
+        self._spatial_index = None
+        self._hearing = None
+        if not keep_time_index:
+            self._time_index = None
 
     def __parse_logs(self, logs: Iterable[str], verbose: bool = False, quiet: bool = False):
+        source = logs if isinstance(logs, MappedLogSource) else None
+        write_errored(self.__parse_lines(tqdm(logs), verbose, quiet, source))
+
+    def __parse_logs_parallel(self, logs: Iterable[str], processes: int, verbose: bool = False, quiet: bool = False):
+        chunks = LogFile.__split_into_chunks(list(LogFile.__group_lines(logs)), processes * PARALLEL_CHUNKS_PER_PROCESS)
         errored = []
-        pbar = tqdm(logs)
-        for line in pbar:
-            line = line.strip()
-            if not line or line == "- -------------------------" or line == '-' \
-                    or "] Starting up round ID " in line or line.startswith("##"):
-                continue
+        with _paused_gc(), ProcessPoolExecutor(processes) as executor:
+            results = executor.map(LogFile._parse_chunk, chunks, repeat(self.lazy), repeat(verbose), repeat(quiet),
+                                   repeat(self.parse_stats is not None))
+            for logs_in_chunk, errored_in_chunk, stats in tqdm(results, total=len(chunks), unit="chunk"):
+                self.unfiltered_logs.extend(logs_in_chunk)
+                errored.extend(errored_in_chunk)
+                if stats is not None:
+                    self.parse_stats.merge(stats)
+        for log in self.unfiltered_logs:
+            # Each process had its own players, make them shared again
+            log.share_players(self.players)
+        if self.lazy:
+            self._who_pending.extend(self.unfiltered_logs)
+        else:
+            self._who.update(log.agent.ckey for log in self.unfiltered_logs if log.agent and log.agent.ckey)
+        write_errored(errored)
+
+    @staticmethod
+    def __split_into_chunks(entries: list[tuple[int, str, list[str]]], count: int) -> list[list[tuple[int, str, list[str]]]]:
+        """Splits entries from `__group_lines` into about `count` chunks. They're grouped already,
+        so a log spanning multiple lines is never split between chunks"""
+        size = max(len(entries) // count + 1, PARALLEL_MIN_CHUNK_SIZE)
+        return [entries[start:start + size] for start in range(0, len(entries), size)]
+
+    @staticmethod
+    def _parse_chunk(entries: list[tuple[int, str, list[str]]], lazy: bool, verbose: bool, quiet: bool,
+                     profile: bool = False) -> tuple[list[Log], list[str], Union[ParseStats, None]]:
+        """Parses a part of a file in another process. Returns the logs, the lines that couldn't be parsed
+        and the parse statistics (if profiling)"""
+        log_file = LogFile(lazy=lazy, profile=profile)
+        errored = log_file.__parse_entries(entries, verbose, quiet)  # pylint: disable=protected-access
+        return log_file.unfiltered_logs, errored, log_file.parse_stats
+
+    def __parse_lines(self, lines: Iterable[str], verbose: bool = False, quiet: bool = False,
+                      source: MappedLogSource = None) -> list[str]:
+        """Parses lines into `unfiltered_logs` and returns the ones that couldn't be parsed.
+        If `lines` is a progress bar, it's kept out of the way of error messages.
+        If they come from `source`, logs will read their lines from there instead of keeping them"""
+        pbar = lines if isinstance(lines, tqdm) else None
+        return self.__parse_entries(LogFile.__group_lines(lines), verbose, quiet, source, pbar)
+
+    def __parse_entries(self, entries: Iterable[tuple[int, str, list[str]]], verbose: bool = False,
+                        quiet: bool = False, source: MappedLogSource = None, pbar: tqdm = None) -> list[str]:
+        """Parses entries from `__group_lines` into `unfiltered_logs` and returns the lines that couldn't be parsed"""
+        errored = []
+        # Decided once, so not profiling costs nothing per line
+        parse_entry = self.__parse_entry if self.parse_stats is None else self.__parse_entry_profiled
+        for index, line, continuations in entries:
             try:
-                self.__parse_one_line(line)
+                log = parse_entry(line, continuations)
+                # Logs spanning multiple lines keep theirs, it's not in the file as is
+                if source is not None and log.raw_line is line:
+                    log.use_source(source, index)
             except Exception as exception:  # pylint: disable=broad-exception-caught
                 errored.append(line)
-                pbar.clear()
+                errored.extend(continuations)
+                if pbar is not None:
+                    pbar.clear()
                 if not quiet:
-                    print(f"Could not be parsed: '{line}', with the reason:", exception)
+                    print(f"Could not be parsed: '{LogFile.__join_continued(line, continuations)}', with the reason:",
+                          exception)
                 if verbose:
                     traceback.print_exc()
-                pbar.display()
-        if errored:
-            with open(ERRORED_FILE, 'a+', encoding="utf-8") as file:
-                file.write("## If you see this, please share it with Riggle.\n")
-                file.write("## ")
-                file.write(__version__)
-                file.write("\n\n")
-                file.writelines(chain.from_iterable(zip(errored, repeat("\n"))))
-
-    def __parse_one_line(self, line: str):
-        if line.startswith("-censored"):
-            return  # Skip censored lines
-
-        # VOTE is split into multiple lines, so account for that
-        if line.startswith("- <b>") and self.unfiltered_logs and self.unfiltered_logs[-1].log_type == LogType.VOTE:
-            self.unfiltered_logs[-1].text += ", " + html_unescape(line.replace("- <b>", "").replace("</b>", ""))
-            return
+                if pbar is not None:
+                    pbar.display()
+        return errored
 
-        # Priority announcements (and others like it) sometimes do this
-        if line.startswith("- ") and self.unfiltered_logs:
-            # Don't actually insert a new line
-            line = self.unfiltered_logs[-1].raw_line + "\\n" + line.replace("- ", "")
-            # Remove the incomplete entry (so we can parse location too!)
-            self.unfiltered_logs.pop()
-        log = Log(line)
+    @staticmethod
+    def __group_lines(lines: Iterable[str]) -> Iterator[tuple[int, str, list[str]]]:
+        """Yields the index and the first line of each log, and the lines continuing it (they start with "- ").
+        A log is only yielded once the next one starts, so it's always complete. Lines that aren't logs are skipped"""
+        first = None
+        first_index = 0
+        continuations = []
+        for index, line in enumerate(lines):
+            line = line.strip()
+            if LogFile.__is_skipped(line):
+                continue
+            if first is not None and line.startswith("- "):
+                continuations.append(line)
+                continue
+            if first is not None:
+                yield first_index, first, continuations
+            first, first_index, continuations = line, index, []
+        if first is not None:
+            yield first_index, first, continuations
+
+    @staticmethod
+    def __is_skipped(line: str) -> bool:
+        """Is this line not a log (empty, a separator, a comment, censored...)?"""
+        return not line or line == "- -------------------------" or line == '-' \
+            or "] Starting up round ID " in line or line.startswith("##") or line.startswith("-censored")
+
+    @staticmethod
+    def __join_continued(line: str, continuations: list[str]) -> str:
+        """Joins a log with the lines continuing it. The line itself is returned if there are none"""
+        if not continuations:
+            return line
+        # Don't actually insert a new line
+        return line + "".join("\\n" + continuation.replace("- ", "") for continuation in continuations)
+
+    def __parse_entry_profiled(self, line: str, continuations: list[str]) -> Log:
+        """Same as `__parse_entry`, but adds how long it took to `parse_stats`"""
+        start = perf_counter()
+        try:
+            log = self.__parse_entry(line, continuations)
+        except Exception:
+            self.parse_stats.record_error(perf_counter() - start, line)
+            raise
+        self.parse_stats.record(log.log_type, perf_counter() - start, line)
+        return log
+
+    def __parse_entry(self, line: str, continuations: list[str]) -> Log:
+        """Parses a line, joined with the lines continuing it, and returns the new log"""
+        # VOTE options are split into multiple lines, they're added to the text instead
+        options = [continuation for continuation in continuations if continuation.startswith("- <b>")]
+        if options:
+            continued = [continuation for continuation in continuations if not continuation.startswith("- <b>")]
+            log = Log(LogFile.__join_continued(line, continued), lazy=self.lazy, players=self.players)
+            if log.log_type == LogType.VOTE:
+                log.text += "".join(", " + html_unescape(option.replace("- <b>", "").replace("</b>", ""))
+                                    for option in options)
+            else:
+                # Not a vote after all, so they're just continued lines
+                log = Log(LogFile.__join_continued(line, continuations), lazy=self.lazy, players=self.players)
+        else:
+            # Priority announcements (and others like it) are continued on the next lines,
+            # they're parsed joined so we get the location too
+            log = Log(LogFile.__join_continued(line, continuations), lazy=self.lazy, players=self.players)
         # TODO: do it properly on next breaking change
         log.logfile_pos = len(self.unfiltered_logs)  # Hack, but it ensures backward compatibility
         # len has O(1) complexity so this should be fine
         self.unfiltered_logs.append(log)
-        if log.agent and log.agent.ckey and log.agent.ckey not in self.who:
-            self.who.append(log.agent.ckey)
+        if self.lazy:
+            self._who_pending.append(log)
+        elif log.agent and log.agent.ckey:
+            self._who.add(log.agent.ckey)
+        return log
 
     def add_log(self, log: Log, reset_workset: bool = True, sort: bool = True) -> None:
-        """Appends a log entry to the end.
+        """Adds a log entry where its time goes, or to the end. Adding logs one by one only moves
+        the logs after it, nothing is sorted again. If it's the latest log nothing moves, and the indexes
+        take it in. Otherwise the ckey, string and spatial indexes (and hearing) are built again the next time
+        they're needed, so adding many logs that way is slow: use `add_logs`, which does it once for all of them
 
         Parameters:
         `log` (Log): the Log object to be added
-        `reset_workset` (bool): if we should also reset the working set
-        `sort` (bool): if we should also sort the logs afterwards
+        `reset_workset` (bool): if we should also reset the working set (if not, the log isn't in it)
+        `sort` (bool): put it where its time goes, instead of at the end
 
         NOTE: the log variable MUST be of type Log
 
@@ -173,59 +431,242 @@ class LogFile:
         """
         if not isinstance(log, Log):
             raise InvalidType(f"Type Log required but type {str(type(log))} was found")
-        self.unfiltered_logs.append(log)
-        if reset_workset:
-            self.reset_work_set()
-        if sort:
-            self.sort()
+        if log.source is not None:
+            self.__add_sources((log.source,))
+        if not sort:
+            log.logfile_pos = len(self.unfiltered_logs)
+            self.unfiltered_logs.append(log)
+            self.__drop_indexes()
+            if reset_workset:
+                self.reset_work_set()
+            return
+        if not self.sortable:
+            raise NotSortableException("Not enough information to sort the logs")
+        # Sorts them the first time, after that the time index keeps them sorted
+        time_index = self.time_index
+        if not self.unfiltered_logs or log.time >= self.unfiltered_logs[-1].time:
+            self.__append([log])
+            if reset_workset:
+                self.reset_work_set()
+            return
+        # Positions moved, the other indexes are built again when needed
+        self.__drop_indexes(keep_time_index=True)
+        position = time_index.insert(log, self.generation)
+        for moved in range(position, len(self.unfiltered_logs)):
+            self.unfiltered_logs[moved].logfile_pos = moved
+        self.logs = WorkingSet.all(self.unfiltered_logs) if reset_workset else self.logs.inserted(position)
 
     def add_logs(self, logs: list[Log], reset_workset: bool = True, sort: bool = True) -> None:
-        """Appends a list of log entries to the end.
+        """Adds a list of log entries. If they're sorted by time already they're merged in linear time,
+        much faster than adding them one by one. If they're also the latest, they're appended and
+        the indexes take them in instead of being built again
 
         Parameters:
         logs (list[Log]): the Log objects list to be added
-        `reset_workset` (bool): if we should also reset the working set
-        `sort` (bool): if we should also sort the logs afterwards
+        `reset_workset` (bool): if we should also reset the working set (if not, they aren't in it)
+        `sort` (bool): put them where their time goes, instead of at the end
 
         Returns None
         """
-        self.unfiltered_logs.extend(logs)
-        if reset_workset:
+        self.__add_sources({log.source for log in logs} - {None})
+        if not sort:
+            for position, log in enumerate(logs, len(self.unfiltered_logs)):
+                log.logfile_pos = position
+            self.unfiltered_logs.extend(logs)
+            self.__drop_indexes()
+            if reset_workset:
+                self.reset_work_set()
+            return
+        if self.__are_latest(logs):
+            self.__append(logs)
+            if reset_workset:
+                self.reset_work_set()
+            return
+        selected = None if reset_workset else list(self.logs)
+        self.__merge(logs)
+        if selected is None:
             self.reset_work_set()
-        if sort:
-            self.sort()
+        else:
+            self.logs = selected
+
+    def __are_latest(self, logs: list[Log]) -> bool:
+        """Are the logs sorted, and from after all the others (which are sorted too)?"""
+        if not logs or not self.sortable or not LogFile.__is_sorted(logs):
+            return False
+        if not self.unfiltered_logs:
+            return True
+        if logs[0].time < self.unfiltered_logs[-1].time:
+            return False
+        # It's only current if they're sorted, so they don't have to be checked
+        return (self._time_index is not None and self._time_index.is_current(self.unfiltered_logs, self.generation)) \
+            or LogFile.__is_sorted(self.unfiltered_logs)
+
+    def __append(self, logs: list[Log]) -> None:
+        """Adds logs to the end, see `__are_latest`. Positions don't change, so the work set stays the same
+        and the indexes only have to take in the new logs"""
+        # The hearing engine comes after the ckey index it uses
+        indexes = [index for index in (self._ckey_index, self._string_index, self._spatial_index, self._time_index,
+                                       self._hearing) if index is not None]
+        current = all(index.is_current(self.unfiltered_logs, self.generation) for index in indexes)
+        for position, log in enumerate(logs, len(self.unfiltered_logs)):
+            log.logfile_pos = position
+        self.unfiltered_logs.extend(logs)
+        if not current:
+            self.__drop_indexes()
+            return
+        for index in indexes:
+            index.extend()
+
+    def __merge(self, logs: Iterable[Log]) -> None:
+        """Adds logs and sorts them all by time. `unfiltered_logs` and the logs are usually sorted already,
+        and sorting finds those runs and merges them (in C, so it's faster than heapq.merge). Ties keep
+        the order they were added in"""
+        if not self.sortable:
+            raise NotSortableException("Not enough information to sort the logs")
+        self.unfiltered_logs.extend(logs)
+        self.unfiltered_logs.sort(key=lambda log: log.time)
+        self.__renumber()
+        self.__drop_indexes()
 
     def sort(self) -> None:
-        """Sorts the current work set, using the time at which the log was added, descending
+        """Sorts the logs, using the time at which the log was added, descending. The work set
+        keeps the same logs
 
         Example call: `my_logs.sort()`
 
         Returns None"""
         if not self.sortable:
             raise NotSortableException("Not enough information to sort the logs")
-        self.logs.sort(key=lambda log: log.time)
+        # Positions only change if they weren't sorted already
+        if LogFile.__is_sorted(self.unfiltered_logs):
+            return
+        selected = list(self.logs)
+        self.unfiltered_logs.sort(key=lambda log: log.time)
+        self.__renumber()
+        self.__drop_indexes()
+        self.logs = selected
 
-    def collate(self, logfile: LogFile) -> None:
-        """Collates (extends, adds together) two LogFile objects and changes the LogFileType to COLLATED.
+    @staticmethod
+    def __is_sorted(logs: list[Log]) -> bool:
+        """Are the logs sorted by time already?"""
+        times = [log.time for log in logs]
+        return all(map(operator.le, times, times[1:]))
+
+    def __renumber(self) -> None:
+        """Sets `logfile_pos` of every log to where it is in `unfiltered_logs`"""
+        for position, log in enumerate(self.unfiltered_logs):
+            log.logfile_pos = position
+
+    def collate(self, *logfiles: LogFile) -> None:
+        """Collates (extends, adds together) LogFile objects and changes the LogFileType to COLLATED.
         The result is stored in the the object this was called on. A call to this function will reset the
-        current work set.
+        current work set. The logs are merged by time in one go, so collating many files at once is much
+        faster than one by one. `logfile_pos` is where each log ends up.
 
         Parameters:
-        `logfile` (LogFile): the LogFile object you want to combine
+        `logfiles` (tuple[LogFile, ...]): the LogFile objects you want to combine
 
         Example:
         `my_logs = LogFile()`
         `my_logs.collate(LogFile.from_file("game.txt"))`
-        `my_logs.collate(LogFile.from_file("attack.txt"))`
+        `my_logs.collate(LogFile.from_file("attack.txt"), LogFile.from_file("say.txt"))`
 
         Returns `None`
         """
-        self.add_logs(logfile.unfiltered_logs, sort=True)
+        for logfile in logfiles:
+            for log in logfile.unfiltered_logs:
+                log.share_players(self.players)
+            # Not `who`, since that would parse lazily loaded logs
+            self._who.update(logfile._who)  # pylint: disable=protected-access
+            self._who_pending.extend(logfile._who_pending)  # pylint: disable=protected-access
+            if logfile.parse_stats is not None:
+                if self.parse_stats is None:
+                    self.parse_stats = ParseStats()
+                self.parse_stats.merge(logfile.parse_stats)
+            self.__add_sources(logfile.sources)
+        self.__merge(chain.from_iterable(logfile.unfiltered_logs for logfile in logfiles))
         self.log_type = LogFileType.COLLATED
-        self.who.extend(logfile.who)
-        self.who = list(set(self.who))  # Remove duplicates
-        self.who.sort()
-        self.logs = self.unfiltered_logs
+        self.reset_work_set()
+
+    def __add_sources(self, sources: Iterable[MappedLogSource]) -> None:
+        """Keeps track of mapped files that logs being added read their lines from, so `close` closes them"""
+        for source in sources:
+            if source not in self.sources:
+                self.sources.append(source)
+
+    def close(self) -> None:
+        """Closes the mapped files the logs read their lines from (see `from_file`). Those logs can't be read
+        after that, even in other LogFiles they were added to. Does nothing if no file was mapped.
+        A LogFile used in `with` is closed at the end of it
+
+        Example call: `my_logs.close()`
+
+        Returns `None`"""
+        for source in self.sources:
+            source.close()
+        self.sources = []
+
+    def __enter__(self) -> LogFile:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def add_lines(self, lines: Iterable[str], verbose: bool = False, quiet: bool = False) -> list[Log]:
+        """Parses more log lines, like the ones written to a log file since it was loaded, and adds the logs
+        (see `add_logs`). They aren't added to the work set. A log is parsed with the lines continuing it
+        that are given, see `follow` for a file that's still being written
+
+        Parameters:
+        `lines` (Iterable[str]): the lines
+        `verbose` (bool): toggle verbose mode (False by default)
+        `quiet` (bool): toggle quiet mode (False by default)
+
+        Example call: `my_logs.add_lines(["[2023-03-01 12:00:00.000] SAY: ckey/(Name) \"Hi!\" (Bar (1,2,3))"])`
+
+        Returns the new logs, `list[Log]`"""
+        buffer = LogFile(lazy=self.lazy)
+        buffer.players = self.players
+        buffer.parse_stats = self.parse_stats
+        write_errored(buffer.__parse_lines(lines, verbose, quiet))  # pylint: disable=protected-access
+        # Not `who`, since that would parse lazily loaded logs
+        self._who.update(buffer._who)  # pylint: disable=protected-access
+        self._who_pending.extend(buffer._who_pending)  # pylint: disable=protected-access
+        logs = buffer.unfiltered_logs
+        logs.sort(key=lambda log: log.time)
+        self.add_logs(logs, reset_workset=False)
+        return logs
+
+    def follow(self, filename: str, query: Callable[[Query], Query] = None, from_end: bool = False,
+               quiet: bool = False) -> LogFollower:
+        """Starts following a log file that's still being written, like during a round. What's in it now
+        is added right away, call `poll()` on what this returns to add what was written since, or `follow()`
+        to keep adding (and printing) new logs until Ctrl+C. Only the new part of the file is read each time,
+        and the indexes aren't built again
+
+        Parameters:
+        `filename` (str): the file to follow
+        `query` (Callable[[Query], Query]): filters new logs have to pass to go into the work set (optional,
+        without it they go in if there are no filters)
+        `from_end` (bool): skip what's in the file now, if you loaded it already (False by default)
+        `quiet` (bool): toggle quiet mode (False by default)
+
+        Example calls: `follower = my_logs.follow("game.txt")`
+        `my_logs.follow("game.txt", lambda query: query.ckey("ckey1").string("help")).follow()`
+
+        Returns `LogFollower`"""
+        follower = LogFollower(self, filename, query, from_end, quiet)
+        follower.poll()
+        return follower
+
+    def query(self) -> Query:
+        """Starts a query: filters that are collected and then run together with `run()`, in the order
+        that's cheapest. Gives the same result as calling the filters one after another, see `Query`
+
+        Example call: `my_logs.query().ckey("ckey1").type((LogType.SAY,)).string("help").run()`
+
+        Returns `Query`"""
+        return Query(self)
 
     def filter_ckeys(self, *ckeys: str, source_only: bool = False) -> None:
         """Removes all logs in which the specified ckeys are not present, saving the result
@@ -233,56 +674,51 @@ class LogFile:
         one who performed the action). See `filter_strings` for a function like Notepad++ bookmark
 
         Parameters:
-        `ckeys` (tuple[str, ...]): ckeys to filter
+        `ckeys` (tuple[str, ...]): ckeys to filter, they don't have to be canonical
+        `source_only` (bool): only count the agent, not the patient
 
         Example call: `my_logs.filter_ckeys("ckey1", "ckey2")` (as many or little ckeys as you want)
 
         Returns `None`"""
-        filtered = []
-        ckeys = [x.casefold() for x in ckeys]
-        for log in self.logs:
-            if (log.agent and log.agent.ckey and log.agent.ckey.casefold() in ckeys) or \
-               (not source_only and log.patient and log.patient.ckey and log.patient.ckey.casefold() in ckeys):
-                filtered.append(log)
+        filtered = self.__select(self.ckey_index.find(*ckeys, patient=not source_only))
         if not filtered:
             print("Operation completed with empty set. Aborting.")
             return
         self.logs = filtered
 
     def filter_strings(self, *strings: str, case_sensitive: bool = False, additive: bool = False) -> None:
-        """Removes all logs in which the specified strings are not present, saving them in
+        """Removes all logs in which none of the specified strings are present, saving them in
         `self.work_set`. Works exactly like Notepad++ bookmark
 
         Parameters:
-        `strings` (tuple[str, ...]): strings to filter
+        `strings` (tuple[str, ...]): strings to filter, a log needs to contain any of them
         `case_sensitive` (bool): toggles case sensitivity
+        `additive` (bool): search all logs, and add the results to the work set
+
+        If `index_strings` is set, only logs the trigram index finds are checked (see `string_index`).
 
         Example calls: `my_logs.filter_strings("Hi!")`
         `my_logs.filter_strings("attacked", "injected", "I hate you")`
         `my_logs.filter_strings("racial slur", case_sensitive=True)` (as many strings as you want)
 
         Returns `None`"""
-        filtered = []
-        logs_it = self.unfiltered_logs if additive else self.logs
-        for log in logs_it:
-            raw_line = log.raw_line
-            if not case_sensitive:
-                raw_line = raw_line.casefold()
-            for string in strings:
-                if not case_sensitive:
-                    string = string.casefold()
-                if string in raw_line:
-                    filtered.append(log)
-                break
+        logs = WorkingSet.all(self.unfiltered_logs) if additive else self.logs
+        candidates = self.string_index.candidates(strings) if self.index_strings else None
+        if candidates is not None:
+            logs = logs & WorkingSet.from_positions(self.unfiltered_logs, candidates)
+        matches = StringMatcher(strings, case_sensitive)
+        if self.sources:
+            # Some logs read their line from a mapped file
+            lines = (log.raw_line for log in logs)
+        else:
+            # Skipping the `raw_line` property saves most of the time here
+            lines = map(Log.kept_line, logs)
+        filtered = WorkingSet.from_positions(self.unfiltered_logs, compress(logs.positions(), matches.each(lines)))
         if not filtered:
             print("Operation completed with empty set. Aborting.")
             return
-        if additive:
-            self.logs.extend(filtered)
-            self.logs = list(set(self.logs))  # Make sure they're unique
-            self.sort()
-        else:
-            self.logs = filtered
+        # Positions are in order, adding them doesn't need sorting
+        self.logs = self.logs | filtered if additive else filtered
 
     def filter_strings_case_sensitive(self, *strings: str) -> None:
         """Shorter for `filter_strings(*strings, case_sensitive = True)`"""
@@ -299,11 +735,9 @@ class LogFile:
         Example call: `my_logs.filter_heard("ckey")`
 
         Returns `None`"""
-        final = set()
-        for ckey in ckeys:
-            final.update(self._get_only_heard(ckey, walking_error=walking_error))
-        self.logs = list(final)
         self.sort()
+        heard = self.hearing.heard(ckeys, HEARING_RANGE + walking_error)
+        self.logs = self.__select(set().union(*heard.values()))
 
     def filter_conversation(self, *ckeys: str, walking_error: int = 4) -> None:
         """Tries to get a conversation between multiple parties, excluding what they would and would not hear as a group.
@@ -317,21 +751,20 @@ class LogFile:
 
         Returns None"""
         self.filter_ckeys(*ckeys, source_only=False)
-        final = self._get_only_heard(ckeys[0], walking_error=walking_error)
-        for ckey in ckeys[1:]:
-            final.intersection_update(self._get_only_heard(ckey, walking_error=walking_error))
+        self.sort()
+        heard = self.hearing.heard(ckeys, HEARING_RANGE + walking_error)
+        final = self.__select(set.intersection(*heard.values()))
 
         if not final:
             print("Operation completed with empty set. Aborting.")
             return
-        self.logs = list(final)
-        self.sort()
+        self.logs = final
 
     def reset_work_set(self):
         """Removes all filters; sets the working set to be equal to all logs
 
         Example call: my_logs.reset_work_set()"""
-        self.logs = self.unfiltered_logs
+        self._work_set = WorkingSet.all(self.unfiltered_logs)
 
     def _get_only_heard(self, ckey: str, logs_we_care_about: Union[list[LogType],
                         Literal["ALL"]] = "ALL", walking_error: int = 4) -> set[Log]:
@@ -349,46 +782,11 @@ class LogFile:
 
         Returns `set[Log]`"""
         self.sort()
+        log_types = None if logs_we_care_about == "ALL" else logs_we_care_about
         # Adjust for error created by lack of logs
-        hearing_range = HEARING_RANGE + walking_error
-        filtered = set()
-        cur_loc = (0, 0, 0)
-        last_loc = cur_loc
-        # Iterate through unfiltered logs to actually get the data we want
-        for log in self.unfiltered_logs:
-            # Check for ckey. If our target was included in the action we can safely assume they saw it
-            if (log.agent and ckey == log.agent.ckey) or\
-               (log.patient and ckey == log.patient.ckey) or\
-               (log.text and f"{ckey}/(" in log.text):
-                # If there's a location attached, update it
-                if log.location:
-                    last_loc = cur_loc
-                    cur_loc = log.location
-                filtered.add(log)
-                continue
-            # If our target didn't participate, we need to check how far away it happened
-
-            # Check z-level, if they differ save location and continue
-            if cur_loc[2] != last_loc[2]:
-                continue
-            # Filter logs that we don't care about but still use their location
-            if logs_we_care_about and (logs_we_care_about != "ALL"):
-                continue
-            if isinstance(logs_we_care_about, list) and log.log_type not in logs_we_care_about:
-                continue
-            # Skip logs with no location data available
-            if not log.location:
-                continue
-            # Calculate distance
-            # if sqrt(pow(cur_loc[0] - log.location[0], 2) + pow(cur_loc[1] - log.location[1], 2)) - hearing_range < 0:
-            if abs(cur_loc[0] - log.location[0]) - hearing_range < 0 and abs(cur_loc[1] - log.location[1]) - hearing_range < 0:
-                filtered.add(log)
-            # You (almost) always hear tcomms
-            elif log.log_type == LogType.TCOMMS:
-                filtered.add(log)
-
+        heard = self.hearing.heard((ckey,), HEARING_RANGE + walking_error, log_types)[ckey]
         # Intersect with currently filtered logs so we don't reset filters
-        return filtered & set(self.logs)
+        return set(self.__select(heard))
 
     def filter_by_location_name(self, location_name: str, exact: bool = False) -> None:
         """Removes all logs that did not happen in the specified location,
@@ -401,14 +799,15 @@ class LogFile:
         Example call: my_logs.filter_by_location_name("Bar")
 
         Returns `None`"""
-        filtered = []
+        positions = []
         location_name = location_name.casefold()
-        for log in self.logs:
+        for position, log in self.logs.items():
             if not log.location_name:
                 continue
             if (not exact and location_name in log.location_name.casefold()) or \
                (location_name == log.location_name.casefold()):
-                filtered.append(log)
+                positions.append(position)
+        filtered = WorkingSet.from_positions(self.unfiltered_logs, positions)
         if not filtered:
             print("Operation completed with empty set. Aborting.")
             return
@@ -421,26 +820,70 @@ class LogFile:
         Parameters:
         `location` (tuple[int, int, int]): the location
         `radius` (int): the radius
+        `exclude_locationless` (bool): remove logs without a location too (True by default)
 
         Example call: `my_logs.filter_by_radius((32, 41, 2), 5)`
 
         Returns None"""
-        filtered = []
-        for log in self.logs:
-            if not log.location:
-                if not exclude_locationless:
-                    filtered.append(log)
-                continue
-            # Z level must match
-            if log.location[2] != location[2]:
-                continue
-            if abs(location[0] - log.location[0]) - radius < 0 and abs(location[1] - log.location[1]) - radius < 0:
-                filtered.append(log)
+        positions = self.spatial_index.within(location, radius)
+        if not exclude_locationless:
+            positions.update(self.spatial_index.locationless)
+        filtered = self.__select(positions)
+        if not filtered:
+            print("Operation completed with empty set. Aborting.")
+            return
+        self.logs = filtered
+
+    def who_near(self, location: tuple[int, int, int], radius: int = HEARING_RANGE) -> set[str]:
+        """Returns the ckeys of everyone who did something around the location (see `filter_by_radius`),
+        at any time. Uses all logs, not just the work set
+
+        Parameters:
+        `location` (tuple[int, int, int]): the location
+        `radius` (int): the radius (hearing range by default)
+
+        Example call: `my_logs.who_near((32, 41, 2))`
+
+        Returns `set[str]`"""
+        logs = self.unfiltered_logs
+        return {logs[position].agent.ckey for position in self.spatial_index.within(location, radius)
+                if logs[position].agent and logs[position].agent.ckey}
+
+    def filter_by_time(self, start: Union[datetime, str] = None, end: Union[datetime, str] = None) -> None:
+        """Removes all logs that didn't happen between `start` and `end` (both included), and stores
+        the result in the work set. Leave one out to not limit it.
+
+        Parameters:
+        `start` (datetime | str): a datetime, a timestamp like "2023-03-01 12:00:00", or only the time of day
+        like "12:00" (on the day the logs start, or the day after if that's before they start)
+        `end` (datetime | str): same as `start`
+
+        Example calls: `my_logs.filter_by_time("12:00", "12:02")`
+        `my_logs.filter_by_time("2023-03-01 12:00:00.000", "2023-03-01 12:02:00.000")`
+        `my_logs.filter_by_time(end=datetime(2023, 3, 1, 12, 30))`
+
+        Returns `None`"""
+        filtered = self.__select(self.time_index.between(self._parse_time(start), self._parse_time(end)))
         if not filtered:
             print("Operation completed with empty set. Aborting.")
             return
         self.logs = filtered
 
+    def _parse_time(self, value: Union[datetime, str, None]) -> Union[datetime, None]:
+        """Turns a timestamp, or only the time of day, into a datetime (see `filter_by_time`)"""
+        if value is None or isinstance(value, datetime):
+            return value
+        value = value.strip()
+        if "-" in value:
+            return decode_timestamp(value)
+        time = time_of_day.fromisoformat(value)
+        if not self.unfiltered_logs:
+            return datetime.combine(datetime.today(), time)
+        first = self.unfiltered_logs[0].time
+        day = datetime.combine(first.date(), time)
+        # The round went past midnight
+        return day if day >= first.replace(second=0, microsecond=0) else day + timedelta(days=1)
+
     def filter_by_type(self, include: Iterable[LogType] = None, exclude: Iterable[LogType] = None):
         """Only keeps (or removes) logs lines of the specified type.
 
@@ -464,36 +907,44 @@ class LogFile:
         if not filter_for:
             print("Nothing to filter for!")
             return
-        filtered = []
-        for log in self.logs:
-            if log.log_type in filter_for:
-                filtered.append(log)
+        filtered = WorkingSet.from_positions(self.unfiltered_logs,
+                                             (position for position, log in self.logs.items()
+                                              if log.log_type in filter_for))
         if not filtered:
             print("Operation completed with empty set. Aborting.")
             return
         self.logs = filtered
 
-    def print_working(self, after: int = 0, before: int = 0, context: int = 0) -> None:
+    def print_working(self, after: int = 0, before: int = 0, context: int = 0, seconds: float = 0) -> None:
         """Prints working set to the console
 
         Parameters:
         `context` (int): print n logs that come before and after (default is 0)
+        `seconds` (float): print all logs from n seconds before to n seconds after (default is 0)
 
-        Example call: `my_logs.print_working()`
+        Example calls: `my_logs.print_working()`
+        `my_logs.print_working(seconds=30)`
 
         Returns `None`"""
         if not self.logs:
             print("Working set empty")
             return
-        if after or before or context:  # abc
+        if seconds:
             term_width = os.get_terminal_size().columns
             for log in self.logs:
                 print("=" * term_width)
-                for i in range(max(before, context), 0, -1):
-                    print(self.unfiltered_logs[log.logfile_pos - i].pretty())
+                for position in self.time_index.around(log.time, seconds):
+                    print(self.unfiltered_logs[position].pretty())
+            return
+        if after or before or context:  # abc
+            term_width = os.get_terminal_size().columns
+            for position, log in self.logs.items():
+                print("=" * term_width)
+                for around in self.unfiltered_logs[max(0, position - max(before, context)):position]:
+                    print(around.pretty())
                 print(log.pretty())
-                for i in range(1, max(after, context) + 1):
-                    print(self.unfiltered_logs[log.logfile_pos + i].pretty())
+                for around in self.unfiltered_logs[position + 1:position + max(after, context) + 1]:
+                    print(around.pretty())
             return
         # Separate loop for performance reasons (probably, didn't test it, doesn't matter much)
         for log in self.logs:
@@ -552,15 +1003,17 @@ class LogFile:
                 file.write(f"## Logs acquired from {self.log_source}")
 
     def __len__(self) -> int:
-        """Returns the length of the logs array"""
+        """Returns how many logs are in the work set"""
         return self.logs.__len__()
 
     def __getitem__(self, key):
-        """Access logs like an array, delegates to the underlying logs list"""
+        """Access logs like an array, delegates to the work set"""
         return self.logs.__getitem__(key)
 
     @staticmethod
-    def from_file(filename: str, log_type: LogFileType = None, verbose: bool = False, quiet: bool = False) -> LogFile:
+    def from_file(filename: str, log_type: LogFileType = None, verbose: bool = False, quiet: bool = False,
+                  lazy: bool = False, processes: int = 1, cache: bool = False, mapped: bool = False,
+                  profile: bool = False) -> LogFile:
         """Parses the specified log file
 
         Parameters:
@@ -569,6 +1022,16 @@ class LogFile:
         (optional, defaults to LogFileType.UNKNOWN)
         `verbose` (bool): toggle verbose mode (False by default)
         `quiet` (bool): toggle quiet mode (False by default)
+        `lazy` (bool): parse most of each log only when it's first used (False by default)
+        `processes` (int): how many processes to parse with, `os.cpu_count()` to use all cores (1 by default)
+        `cache` (bool): save the parsed logs in your cache folder, and load them from there next time
+        if neither the file nor the parser changed, see `log_cache` (False by default)
+        `mapped` (bool): memory map the file and read log lines from it when they're needed instead of keeping
+        them all in memory. The file must not change while you're using the logs, and stays open (locked on
+        Windows) until you `close` the LogFile or use it in `with`. Can't be used with `processes`
+        (False by default)
+        `profile` (bool): record how long each type of log takes to parse in `parse_stats`. The file is parsed
+        even if it has a cache, there'd be nothing to measure otherwise (False by default)
 
         Example call: `my_logs = LogFile.from_file("game.txt")`
 
@@ -577,19 +1040,111 @@ class LogFile:
             raise UnsupportedLogTypeException(f"{filename} does not seem to be supported")
         if not log_type and "." in filename:
             log_type = LogFileType.parse_log_file_type(filename.split(".", 1)[0])
-        with open(filename, "r", encoding="utf-8") as file:
-            return LogFile(file, log_type, verbose, quiet)
+        if cache and not profile:
+            log_file = LogFile.__from_cache(filename, log_type, lazy)
+            if log_file:
+                return log_file
+        if mapped:
+            source = MappedLogSource(filename)
+            try:
+                log_file = LogFile(source, log_type, verbose, quiet, lazy, profile=profile)
+            except BaseException:
+                source.close()
+                raise
+        else:
+            with open(filename, "r", encoding="utf-8") as file:
+                log_file = LogFile(file, log_type, verbose, quiet, lazy, processes, profile)
+        if cache:
+            # Connected ckeys of lazy logs aren't known yet, they'll be found again when loading
+            log_cache.save(filename, log_file.unfiltered_logs, None if lazy else log_file.who, lazy)
+        return log_file
 
     @staticmethod
-    def from_folder(folder: str, verbose: bool = False, quiet: bool = False) -> LogFile:
+    def __from_cache(filename: str, log_type: LogFileType, lazy: bool) -> Union[LogFile, None]:
+        """Loads a file's logs from its cache. Returns None if it has no cache or it's outdated"""
+        with _paused_gc():
+            cached = log_cache.load(filename, lazy)
+        if not cached:
+            return None
+        logs, who = cached
+        log_file = LogFile(log_type=log_type, lazy=lazy)
+        for log in logs:
+            log.share_players(log_file.players)
+        log_file.unfiltered_logs = logs
+        log_file.reset_work_set()
+        if who is None:
+            log_file._who_pending = list(logs)  # pylint: disable=protected-access
+        else:
+            log_file.who = who
+        return log_file
+
+    @staticmethod
+    def iter_file(filename: str, log_types: Iterable[LogType] = None, ckeys: Iterable[str] = None,
+                  verbose: bool = False, quiet: bool = False, lazy: bool = False) -> Iterator[Log]:
+        """Parses a log file one log at a time, without ever holding more than one of them. Useful for going
+        through lots of logs once (counting, searching, exporting). Logs come in the order they're in the file,
+        they're not sorted. Lines that can't be parsed are handled the same way as in `from_file`
+
+        Parameters:
+        `filename` (str): name (and location) of the desired file
+        `log_types` (Iterable[LogType]): only yield logs of these types (optional)
+        `ckeys` (Iterable[str]): only yield logs where one of these ckeys is the agent or patient (optional)
+        `verbose` (bool): toggle verbose mode (False by default)
+        `quiet` (bool): toggle quiet mode (False by default)
+        `lazy` (bool): parse most of each log only when it's first used, see `Log` (False by default).
+        Logs of types you don't want are then skipped without parsing them
+
+        Example calls:
+        `for log in LogFile.iter_file("game.txt", log_types=(LogType.SAY,)): print(log.text)`
+        `sum(1 for _ in LogFile.iter_file("game.txt", ckeys=("ckey1",)))`
+
+        Yields `Log`"""
+        log_types = frozenset(log_types) if log_types is not None else None
+        ckeys = frozenset(canonicalize(ckey) for ckey in ckeys) if ckeys is not None else None
+        # Parses one entry at a time, and takes the log right back out
+        buffer = LogFile(lazy=lazy)
+        # Nothing keeps the logs, so the players and locations they share don't have to be kept either
+        buffer.players = PlayerRegistry(UNOWNED_REGISTRY_LIMIT)
+        logs = buffer.unfiltered_logs
+        errored = []
+        position = 0
+        try:
+            with open(filename, "r", encoding="utf-8") as file:
+                for entry in LogFile.__group_lines(file):
+                    errored += buffer.__parse_entries((entry,), verbose, quiet)  # pylint: disable=protected-access
+                    buffer._who_pending.clear()  # pylint: disable=protected-access
+                    if not logs:
+                        continue
+                    log = logs.pop()
+                    log.logfile_pos = position
+                    position += 1
+                    if (log_types is None or log.log_type in log_types) and \
+                            (ckeys is None or LogFile.__has_any_ckey(log, ckeys)):
+                        yield log
+        finally:
+            write_errored(errored)
+
+    @staticmethod
+    def __has_any_ckey(log: Log, ckeys: frozenset[str]) -> bool:
+        """Is any of the ckeys the agent or the patient?"""
+        return (log.agent is not None and log.agent.ckey in ckeys) or \
+            (log.patient is not None and log.patient.ckey in ckeys)
+
+    @staticmethod
+    def from_folder(folder: str, verbose: bool = False, quiet: bool = False, lazy: bool = False,
+                    processes: int = 1, cache: bool = False, profile: bool = False) -> LogFile:
         """Parses all log files in a folder, combining them into a single file
 
         Parameters:
         `filename` (str): name (and location) of the desired folder
         `verbose` (bool): toggle verbose mode (False by default)
         `quiet` (bool): toggle quiet mode (False by default)
+        `lazy` (bool): parse most of each log only when it's first used (False by default)
+        `processes` (int): how many files to parse at the same time (1 by default)
+        `cache` (bool): use and save a cache for each file, see `from_file` (False by default)
+        `profile` (bool): record parse statistics of all files in `parse_stats`, see `from_file` (False by default)
 
-        Example call: `my_logs = LogFile.from_file("game.txt")`
+        Example call: `my_logs = LogFile.from_folder("logs")`
 
         Returns `LogFile`"""
         if not os.path.isdir(folder):
@@ -597,26 +1152,46 @@ class LogFile:
         folder = folder.replace("\\", "/")
         if folder[-1] != "/":
             folder += "/"
-        log_collection = LogFile()
-        for file in os.listdir(folder):
-            if not quiet:
-                print("Parsing", file)
-            try:
-                log_collection.collate(LogFile.from_file(folder + file, verbose=verbose, quiet=quiet))
-            except UnsupportedLogTypeException:
-                if not quiet:
-                    print(f"{file} isn't supported, skipping")
-                continue
+        log_collection = LogFile(lazy=lazy, profile=profile)
+        files = os.listdir(folder)
+        arguments = ([folder + file for file in files], repeat(verbose), repeat(quiet), repeat(lazy), repeat(cache),
+                     repeat(profile))
+        if processes > 1:
+            with ProcessPoolExecutor(processes) as executor:
+                log_files = list(executor.map(LogFile._load_file, *arguments))
+        else:
+            log_files = map(LogFile._load_file, *arguments)
+        loaded = []
+        for file, log_file in zip(files, log_files):
+            if log_file:
+                loaded.append(log_file)
+            elif not quiet:
+                print(f"{file} isn't supported, skipping")
+        # All at once, so it's one merge
+        log_collection.collate(*loaded)
         return log_collection
 
     @staticmethod
-    def from_round_id(round_id: int, logs_we_care_about: list[str] = None) -> LogFile:
+    def _load_file(filename: str, verbose: bool, quiet: bool, lazy: bool, cache: bool,
+                   profile: bool = False) -> Union[LogFile, None]:
+        """Same as `from_file`, but returns None if the file isn't supported. Also used by other processes"""
+        if not quiet:
+            print("Parsing", os.path.basename(filename))
+        try:
+            return LogFile.from_file(filename, verbose=verbose, quiet=quiet, lazy=lazy, cache=cache,
+                                     profile=profile)
+        except UnsupportedLogTypeException:
+            return None
+
+    @staticmethod
+    def from_round_id(round_id: int, logs_we_care_about: list[str] = None, lazy: bool = False) -> LogFile:
         """Downloads multiple files from a round ID.
 
         Parameters:
         `round_id` (int): round to download
         `logs_we_care_about` (list[str]): list of strings, containing the file names.
         For example: `["game.txt", "attack.txt"]`. This defaults to all supported files.
+        `lazy` (bool): parse most of each log only when it's first used, see `from_file` (False by default)
 
         Example call: `my_logs = LogFile.from_round_id(185556)`
 
@@ -630,7 +1205,7 @@ class LogFile:
         downloader.files = logs_we_care_about
         downloader.try_authenticate_interactive()
         asyncio.run(downloader.process_and_write())
-        log_collection = LogFile.from_file(downloader.output_path)
+        log_collection = LogFile.from_file(downloader.output_path, lazy=lazy)
         log_collection.log_type = LogFileType.COLLATED
         # Sort the logs
         log_collection.log_source = get_round_source_url(round_id=round_id)
@@ -638,7 +1213,8 @@ class LogFile:
         return log_collection
 
     @staticmethod
-    def from_round_range(start_round_id: int, end_round_id: int, logs_we_care_about: list[str] = None) -> LogFile:
+    def from_round_range(start_round_id: int, end_round_id: int, logs_we_care_about: list[str] = None,
+                         lazy: bool = False) -> LogFile:
         """Downloads multiple rounds worth of data.
 
         Parameters:
@@ -646,6 +1222,7 @@ class LogFile:
         `end_round_id` (int): last round to download (inclusive)
         `logs_we_care_about` (list[str]): list of strings, containing the file names.
         For example: `["game.txt", "attack.txt"]`. This defaults to all supported files.
+        `lazy` (bool): parse most of each log only when it's first used, see `from_file` (False by default)
 
         Example call: `my_logs = LogFile.from_multiple_rounds(185556, 191100)`
 
@@ -659,20 +1236,21 @@ class LogFile:
         downloader.files = logs_we_care_about
         downloader.try_authenticate_interactive()
         asyncio.run(downloader.process_and_write())
-        log_collection = LogFile.from_file(downloader.output_path)
+        log_collection = LogFile.from_file(downloader.output_path, lazy=lazy)
         log_collection.log_type = LogFileType.COLLATED
         log_collection.log_source = f"{start_round_id}-{end_round_id}"
         log_collection.write_working_to_file(downloader.output_path, force_overwrite=True)
         return log_collection
 
     @staticmethod
-    def from_round_collection(*rounds: int, logs_we_care_about: list[str] = None) -> LogFile:
+    def from_round_collection(*rounds: int, logs_we_care_about: list[str] = None, lazy: bool = False) -> LogFile:
         """Downloads multiple rounds worth of data.
 
         Parameters:
         `*rounds` (int): list of rounds to download
         `logs_we_care_about` (list[str]): list of strings, containing the file names.
         For example: `["game.txt", "attack.txt"]`. This defaults to all supported files.
+        `lazy` (bool): parse most of each log only when it's first used, see `from_file` (False by default)
 
         Example call: `my_logs = LogFile.from_round_collection(185556, 185558, 185560, ...)`
 
@@ -686,7 +1264,7 @@ class LogFile:
         downloader.files = logs_we_care_about
         downloader.try_authenticate_interactive()
         asyncio.run(downloader.process_and_write())
-        log_collection = LogFile.from_file(downloader.output_path)
+        log_collection = LogFile.from_file(downloader.output_path, lazy=lazy)
         log_collection.log_type = LogFileType.COLLATED
         log_collection.log_source = "rounds " + ', '.join(str(x) for x in rounds)
         log_collection.write_working_to_file(downloader.output_path, force_overwrite=True)
@@ -694,7 +1272,7 @@ class LogFile:
 
     @staticmethod
     def from_ckey(ckey: str, rounds: int = 20, only_played: bool = False, filter_logs: bool = False,
-                  logs_we_care_about: list[str] = None) -> LogFile:
+                  logs_we_care_about: list[str] = None, lazy: bool = False) -> LogFile:
         """Downloads multiple rounds worth of data, where the specified ckey was present.
 
         Parameters:
@@ -703,6 +1281,7 @@ class LogFile:
         `filter` (bool): pre-emptively delete all logs not containing their ckey
         `logs_we_care_about` (list[str]): list of strings, containing the file names.
         For example: `["game.txt", "attack.txt"]`. This defaults to all supported files.
+        `lazy` (bool): parse most of each log only when it's first used, see `from_file` (False by default)
 
         Example call: `my_logs = LogFile.from_ckey("Riggle")`
 
@@ -717,7 +1296,7 @@ class LogFile:
         downloader.filter_logs = filter_logs
         downloader.try_authenticate_interactive()
         asyncio.run(downloader.process_and_write())
-        log_collection = LogFile.from_file(downloader.output_path)
+        log_collection = LogFile.from_file(downloader.output_path, lazy=lazy)
         log_collection.log_type = LogFileType.COLLATED
         log_collection.log_source = f"{rounds} latest rounds that {ckey} played in"
         log_collection.write_working_to_file(downloader.output_path, force_overwrite=True)
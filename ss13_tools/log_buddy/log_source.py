@@ -0,0 +1,73 @@
+"""Reads log lines straight from a memory mapped file, so they don't all have to be kept as strings"""
+import mmap
+from array import array
+from typing import Iterator
+
+
+class MappedLogSource:
+    """A memory mapped log file with an index of where each line starts. Lines are read from the mapping
+    whenever they're asked for, so only the index (8 bytes a line) is kept in memory.
+
+    The file must not change while it's mapped. Remember to `close` it (or use `with`) when you're done,
+    logs that use it can't be read after that.
+
+    Parameters:
+    `filename` (str): name (and location) of the file
+
+    Examples:
+    `source = MappedLogSource("game.txt")`
+    `source.line(0)` # The first line, stripped
+    """
+    __slots__ = ('filename', '_file', '_mapping', '_offsets')
+
+    filename: str
+    _offsets: array
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self._file = open(filename, "rb")  # pylint: disable=consider-using-with
+        try:
+            # Can't map an empty file
+            self._mapping = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) \
+                if self._file.seek(0, 2) else b""
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self._offsets = self.__index_lines()
+
+    def __index_lines(self) -> array:
+        """Finds where every line starts. The last offset is the end of the file, so line `i`
+        always ends where line `i + 1` starts"""
+        offsets = array('Q', [0])
+        mapping = self._mapping
+        find = mapping.find
+        end = len(mapping)
+        position = find(b"\n") + 1
+        while position:
+            offsets.append(position)
+            position = find(b"\n", position) + 1
+        if offsets[-1] != end:
+            offsets.append(end)
+        return offsets
+
+    def line(self, index: int) -> str:
+        """Returns a line without surrounding whitespace (or the newline)"""
+        return self._mapping[self._offsets[index]:self._offsets[index + 1]].decode("utf-8").strip()
+
+    def close(self) -> None:
+        """Unmaps the file"""
+        if isinstance(self._mapping, mmap.mmap):
+            self._mapping.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.line, range(len(self)))
+
+    def __enter__(self) -> "MappedLogSource":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
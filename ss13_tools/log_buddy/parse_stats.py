@@ -0,0 +1,153 @@
+"""Keeps track of how long parsing each type of log takes"""
+import heapq
+from typing import Annotated, Optional
+
+from .log import LogType
+from .constants import PARSE_STATS_SLOWEST
+
+
+class LogTypeStats:
+    """Statistics for one log type"""
+    __slots__ = ('lines', 'errors', 'seconds')
+
+    lines: Annotated[int, "How many lines were parsed (including ones that errored)"]
+    errors: Annotated[int, "How many lines couldn't be parsed"]
+    seconds: Annotated[float, "Time spent parsing, in seconds"]
+
+    def __init__(self) -> None:
+        self.lines = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+    def merge(self, other: "LogTypeStats") -> None:
+        """Adds statistics of the same log type from somewhere else"""
+        self.lines += other.lines
+        self.errors += other.errors
+        self.seconds += other.seconds
+
+    def as_dict(self) -> dict:
+        """Returns the statistics as a dictionary"""
+        return {
+            "lines": self.lines,
+            "errors": self.errors,
+            "seconds": self.seconds,
+            "microseconds_per_line": self.seconds / self.lines * 1e6 if self.lines else 0.0,
+        }
+
+
+class ParseStats:
+    """Parse statistics for each log type, and the lines that took the longest. Logs spanning multiple
+    lines count as one line, logs without a type (TGUI logs) are counted under None.
+
+    If logs were loaded lazily, only the part parsed when loading is counted.
+
+    Parameters:
+    `slowest` (int): how many of the slowest lines to remember
+
+    Examples:
+    `LogFile.from_file("game.txt", profile=True).parse_stats.report()`
+    `print(LogFile.from_file("game.txt", profile=True).parse_stats)`
+    """
+    __slots__ = ('by_type', 'slowest_count', '_slowest', '_counter')
+
+    by_type: Annotated[dict[Optional[LogType], LogTypeStats], "Statistics for each log type"]
+    slowest_count: Annotated[int, "How many of the slowest lines are remembered"]
+
+    def __init__(self, slowest: int = PARSE_STATS_SLOWEST) -> None:
+        self.by_type = {}
+        self.slowest_count = slowest
+        # Min heap of (seconds, tie breaker, line), so the fastest of the slow lines is the one to go
+        self._slowest = []
+        self._counter = 0
+
+    def record(self, log_type: Optional[LogType], seconds: float, line: str, failed: bool = False) -> None:
+        """Adds one parsed log"""
+        stats = self.by_type.get(log_type)
+        if stats is None:
+            stats = self.by_type[log_type] = LogTypeStats()
+        stats.lines += 1
+        stats.seconds += seconds
+        if failed:
+            stats.errors += 1
+        self.__remember(seconds, line)
+
+    def record_error(self, seconds: float, line: str) -> None:
+        """Adds a line that couldn't be parsed. Its type is guessed from the category"""
+        self.record(guess_log_type(line), seconds, line, failed=True)
+
+    def __remember(self, seconds: float, line: str) -> None:
+        if len(self._slowest) < self.slowest_count:
+            self._counter += 1
+            heapq.heappush(self._slowest, (seconds, self._counter, line))
+        elif self._slowest and seconds > self._slowest[0][0]:
+            self._counter += 1
+            heapq.heapreplace(self._slowest, (seconds, self._counter, line))
+
+    def merge(self, other: "ParseStats") -> None:
+        """Adds statistics from somewhere else (another file, or another process)"""
+        for log_type, other_stats in other.by_type.items():
+            stats = self.by_type.get(log_type)
+            if stats is None:
+                stats = self.by_type[log_type] = LogTypeStats()
+            stats.merge(other_stats)
+        for seconds, line in other.slowest():
+            self.__remember(seconds, line)
+
+    def slowest(self) -> list[tuple[float, str]]:
+        """Returns the slowest lines and how long they took, slowest first"""
+        return [(seconds, line) for seconds, _, line in sorted(self._slowest, reverse=True)]
+
+    @property
+    def lines(self) -> int:
+        """How many lines were parsed in total"""
+        return sum(stats.lines for stats in self.by_type.values())
+
+    @property
+    def errors(self) -> int:
+        """How many lines couldn't be parsed in total"""
+        return sum(stats.errors for stats in self.by_type.values())
+
+    @property
+    def seconds(self) -> float:
+        """Total time spent parsing, in seconds"""
+        return sum(stats.seconds for stats in self.by_type.values())
+
+    def report(self) -> dict:
+        """Returns all statistics as a dictionary. Log types are sorted by time spent, most first"""
+        by_time = sorted(self.by_type.items(), key=lambda item: item[1].seconds, reverse=True)
+        return {
+            "lines": self.lines,
+            "errors": self.errors,
+            "seconds": self.seconds,
+            "by_type": {log_type.name if log_type else None: stats.as_dict() for log_type, stats in by_time},
+            "slowest": self.slowest(),
+        }
+
+    def __str__(self) -> str:
+        report = self.report()
+        rows = [f"{'type':<14}{'lines':>10}{'errors':>8}{'ms':>10}{'us/line':>10}"]
+        for name, stats in report["by_type"].items():
+            rows.append(f"{str(name):<14}{stats['lines']:>10}{stats['errors']:>8}{stats['seconds'] * 1e3:>10.1f}"
+                        f"{stats['microseconds_per_line']:>10.1f}")
+        rows.append(f"{'total':<14}{report['lines']:>10}{report['errors']:>8}{report['seconds'] * 1e3:>10.1f}")
+        if report["slowest"]:
+            rows.append("")
+            rows.append("Slowest lines:")
+            rows.extend(f"{seconds * 1e6:>10.1f} us  {line}" for seconds, line in report["slowest"])
+        return "\n".join(rows)
+
+
+def guess_log_type(line: str) -> Optional[LogType]:
+    """Guesses the log type of a line from its category, without parsing it. Returns None if there's no category"""
+    if line.startswith("{"):
+        # JSON logs, "cat":"game-say"
+        _, found, rest = line.partition('"cat":')
+        if not found:
+            return None
+        category = rest.lstrip(' "').split('"', 1)[0]
+    else:
+        _, found, rest = line.partition("] ")
+        if not found or ": " not in rest:
+            return None
+        category = rest.split(": ", 1)[0]
+    return LogType.parse_log_type(category.upper().replace("GAME-", "", 1))
@@ -0,0 +1,223 @@
+"""Filters that are collected first and then run together, in the order that's cheapest"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from time import perf_counter
+from typing import TYPE_CHECKING, Annotated, Callable, Iterable, Optional, Union
+
+from .log import Log, LogType
+from .string_matcher import StringMatcher
+from .working_set import WorkingSet
+from .constants import QUERY_SAMPLE_SIZE
+
+if TYPE_CHECKING:
+    from .log_parser import LogFile
+
+
+@dataclass
+class IndexStep:
+    """A filter answered by an index, without looking at the logs"""
+    name: str
+    cost: Annotated[int, "Rough cost compared to the other index steps, cheapest are run first"]
+    select: Annotated[Callable[[], Optional[WorkingSet]], "Returns the matching logs, or None if it can't tell"]
+    found: Annotated[Optional[int], "How many logs it found, None if it wasn't run or couldn't tell"] = None
+    seconds: Annotated[float, "How long it took"] = 0
+
+
+@dataclass
+class ScanStep:
+    """A filter that has to look at each log"""
+    name: str
+    cost: Annotated[int, "Rough cost compared to the other scan steps, used until it's measured"]
+    check: Annotated[Callable[[Log], bool], "Does the log pass?"]
+    pass_rate: Annotated[Optional[float], "How many of the sampled logs passed, None if not sampled"] = None
+    seconds_per_log: Annotated[Optional[float], "How long checking a sampled log took"] = None
+    checked: Annotated[int, "How many logs it checked"] = 0
+    passed: Annotated[int, "How many of those passed"] = 0
+
+    def rank(self) -> float:
+        """Lower is checked first: cheap steps that throw away the most logs"""
+        if self.pass_rate is None:
+            return self.cost
+        if self.pass_rate >= 1:
+            return float("inf")
+        return self.seconds_per_log / (1 - self.pass_rate)
+
+
+class Query:
+    """Collects filters and runs them together on the work set. Index lookups (ckeys, radius, time,
+    and the string index if it's on) are run first, cheapest first, and combined until nothing is left.
+    Filters that have to look at each log (type, location name, strings) are sampled on a few of the logs
+    that are left, then checked in a single pass, the ones that throw away the most logs for the least
+    time first. Same result as calling the filters one after another.
+
+    Parameters:
+    `log_file` (LogFile): the logs to filter
+
+    Examples:
+    `query = my_logs.query().ckey("ckey1").type((LogType.SAY,)).string("help").run()`
+    `print(query.explain())` # The order the filters ran in, and how long they took
+    """
+    __slots__ = ('log_file', 'index_steps', 'scan_steps', 'found', 'seconds')
+
+    log_file: LogFile
+    index_steps: list[IndexStep]
+    scan_steps: list[ScanStep]
+    found: Annotated[Optional[int], "How many logs were found, None if it wasn't run"]
+    seconds: Annotated[float, "How long running it took"]
+
+    def __init__(self, log_file: LogFile) -> None:
+        self.log_file = log_file
+        self.index_steps = []
+        self.scan_steps = []
+        self.found = None
+        self.seconds = 0
+
+    def ckey(self, *ckeys: str, source_only: bool = False) -> Query:
+        """Only logs the ckeys are in, see `LogFile.filter_ckeys`"""
+        self.index_steps.append(IndexStep(
+            f"ckey {', '.join(ckeys)}", 1,
+            lambda: self.__select(self.log_file.ckey_index.find(*ckeys, patient=not source_only))))
+        return self
+
+    def time(self, start: Union[datetime, str] = None, end: Union[datetime, str] = None) -> Query:
+        """Only logs from `start` to `end`, see `LogFile.filter_by_time`"""
+        # pylint: disable=protected-access
+        start, end = self.log_file._parse_time(start), self.log_file._parse_time(end)
+        self.index_steps.append(IndexStep(
+            f"time {start or 'start'} - {end or 'end'}", 1,
+            lambda: WorkingSet.from_range(self.log_file.unfiltered_logs, self.log_file.time_index.between(start, end))))
+        return self
+
+    def radius(self, location: tuple[int, int, int], radius: int, exclude_locationless: bool = True) -> Query:
+        """Only logs around the location, see `LogFile.filter_by_radius`"""
+        def select() -> WorkingSet:
+            positions = self.log_file.spatial_index.within(location, radius)
+            if not exclude_locationless:
+                positions.update(self.log_file.spatial_index.locationless)
+            return self.__select(positions)
+        self.index_steps.append(IndexStep(f"radius {radius} around {location}", 2, select))
+        return self
+
+    def type(self, include: Iterable[LogType] = None, exclude: Iterable[LogType] = None) -> Query:
+        """Only (or no) logs of these types, see `LogFile.filter_by_type`"""
+        filter_for = frozenset(set(LogType) & set(include) if include else set(LogType) - set(exclude or ()))
+        if not filter_for:
+            print("Nothing to filter for!")
+            return self
+        self.scan_steps.append(ScanStep(
+            f"type {', '.join(sorted(str(log_type) for log_type in filter_for))}", 1,
+            lambda log: log.log_type in filter_for))
+        return self
+
+    def location(self, location_name: str, exact: bool = False) -> Query:
+        """Only logs that happened in the location, see `LogFile.filter_by_location_name`"""
+        location_name = location_name.casefold()
+
+        def check(log: Log) -> bool:
+            if not log.location_name:
+                return False
+            name = log.location_name.casefold()
+            return location_name == name or (not exact and location_name in name)
+        self.scan_steps.append(ScanStep(f"location {location_name}", 2, check))
+        return self
+
+    def string(self, *strings: str, case_sensitive: bool = False) -> Query:
+        """Only logs that contain any of the strings, see `LogFile.filter_strings`"""
+        if self.log_file.index_strings:
+            self.index_steps.append(IndexStep(f"string index {', '.join(strings)}", 3, lambda: self.__candidates(strings)))
+        matches = StringMatcher(strings, case_sensitive)
+        self.scan_steps.append(ScanStep(f"string {', '.join(strings)}", 5, lambda log: matches(log.raw_line)))
+        return self
+
+    def __select(self, positions: Iterable[int]) -> WorkingSet:
+        return WorkingSet.from_positions(self.log_file.unfiltered_logs, positions)
+
+    def __candidates(self, strings: tuple[str, ...]) -> Optional[WorkingSet]:
+        candidates = self.log_file.string_index.candidates(strings)
+        return None if candidates is None else self.__select(candidates)
+
+    def run(self) -> Query:
+        """Runs the filters and saves the result in the work set. Nothing changes if no logs are left
+
+        Returns the query, see `explain`"""
+        found = self.matching(self.log_file.logs)
+        if not found:
+            print("Operation completed with empty set. Aborting.")
+            return self
+        self.log_file.logs = found
+        return self
+
+    def matching(self, logs: WorkingSet) -> WorkingSet:
+        """Runs the filters on some of the logs (instead of the work set) and returns the ones that pass.
+        The work set doesn't change"""
+        start = perf_counter()
+        found = self.__run_index_steps(logs)
+        if found and self.scan_steps:
+            self.__sample(found)
+            found = self.__scan(found)
+        self.found = len(found)
+        self.seconds = perf_counter() - start
+        return found
+
+    def __run_index_steps(self, found: WorkingSet) -> WorkingSet:
+        """Narrows the work set down with the index steps, cheapest first. Stops once nothing is left"""
+        self.index_steps.sort(key=lambda step: step.cost)
+        for step in self.index_steps:
+            if not found:
+                break
+            start = perf_counter()
+            selected = step.select()
+            if selected is not None:
+                found = found & selected
+                step.found = len(selected)
+            step.seconds = perf_counter() - start
+        return found
+
+    def __sample(self, found: WorkingSet) -> None:
+        """Times the scan steps on a few of the logs and orders them, see `ScanStep.rank`"""
+        every = max(1, len(found) // QUERY_SAMPLE_SIZE)
+        sample = list(islice(found, 0, every * QUERY_SAMPLE_SIZE, every))
+        for step in self.scan_steps:
+            start = perf_counter()
+            passed = sum(1 for log in sample if step.check(log))
+            step.seconds_per_log = (perf_counter() - start) / len(sample)
+            step.pass_rate = passed / len(sample)
+        self.scan_steps.sort(key=ScanStep.rank)
+
+    def __scan(self, found: WorkingSet) -> WorkingSet:
+        """Checks every log that's left once, with all the scan steps"""
+        positions = []
+        steps = self.scan_steps
+        for position, log in found.items():
+            for step in steps:
+                step.checked += 1
+                if not step.check(log):
+                    break
+                step.passed += 1
+            else:
+                positions.append(position)
+        return self.__select(positions)
+
+    def explain(self) -> str:
+        """Returns the order the filters run (or ran) in, with how many logs each found and how long they took"""
+        lines = ["Query plan:"]
+        for step in sorted(self.index_steps, key=lambda step: step.cost):
+            if step.found is None:
+                lines.append(f"  index {step.name}: " + ("not run" if self.found is None else "skipped"))
+            else:
+                lines.append(f"  index {step.name}: {step.found} logs, {step.seconds * 1000:.2f} ms")
+        for step in sorted(self.scan_steps, key=ScanStep.rank):
+            if step.pass_rate is None:
+                lines.append(f"  scan  {step.name}: not run")
+            else:
+                lines.append(f"  scan  {step.name}: {step.passed}/{step.checked} passed "
+                             f"(sampled {step.pass_rate:.0%} at {step.seconds_per_log * 1e6:.2f} us/log)")
+        if self.found is not None:
+            lines.append(f"Found {self.found} logs in {self.seconds * 1000:.2f} ms")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.explain()
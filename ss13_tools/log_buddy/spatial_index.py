@@ -0,0 +1,64 @@
+"""Finds the logs that happened around a place without looking at all of them"""
+from array import array
+from typing import Annotated
+
+from .log import Log
+from .log_index import LogIndex
+from .constants import SPATIAL_CHUNK_SIZE
+
+
+class SpatialIndex(LogIndex):
+    """Logs by where they happened. Each z level is split into square chunks of tiles, and each chunk has
+    an array of the positions of the logs that happened in it, smallest first. Looking around a place only
+    has to check the chunks close enough to it. See `LogIndex`
+
+    Parameters:
+    `logs` (list[Log]): logs to index
+    `chunk_size` (int): how many tiles wide a chunk is
+
+    Examples:
+    `index = SpatialIndex(my_logs.unfiltered_logs)`
+    `index.within((32, 41, 2), 5)` # Positions of logs that happened less than 5 tiles away
+    """
+    __slots__ = ('chunk_size', 'chunks', 'locationless')
+
+    chunk_size: Annotated[int, "How many tiles wide a chunk is"]
+    chunks: Annotated[dict[tuple[int, int, int], array], "Positions of logs by z level and chunk"]
+    locationless: Annotated[array, "Positions of logs without a location"]
+
+    def __init__(self, logs: list[Log], chunk_size: int = SPATIAL_CHUNK_SIZE, generation: int = 0) -> None:
+        super().__init__(logs, generation)
+        self.chunk_size = chunk_size
+        self.chunks = {}
+        self.locationless = array('I')
+        self.extend()
+
+    def _add(self, logs: list[Log], start: int) -> None:
+        chunk_size = self.chunk_size
+        for position, log in enumerate(logs, start):
+            location = log.location
+            if not location:
+                self.locationless.append(position)
+                continue
+            key = (location[2], location[0] // chunk_size, location[1] // chunk_size)
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                chunk = self.chunks[key] = array('I')
+            chunk.append(position)
+
+    def within(self, location: tuple[int, int, int], radius: int) -> set[int]:
+        """Returns the positions of logs on the same z level that are less than `radius` tiles away
+        from `location` on both axes (a square, like `LogFile.filter_by_radius`)"""
+        x, y, z = location
+        size = self.chunk_size
+        positions = set()
+        for chunk_x in range((x - radius + 1) // size, (x + radius - 1) // size + 1):
+            for chunk_y in range((y - radius + 1) // size, (y + radius - 1) // size + 1):
+                chunk = self.chunks.get((z, chunk_x, chunk_y))
+                if chunk is None:
+                    continue
+                for position in chunk:
+                    log_x, log_y, _ = self.logs[position].location
+                    if abs(x - log_x) < radius and abs(y - log_y) < radius:
+                        positions.add(position)
+        return positions
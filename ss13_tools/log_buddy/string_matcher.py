@@ -0,0 +1,74 @@
+"""Looks for several strings in a line at once"""
+from itertools import repeat
+from operator import contains
+from typing import Annotated, Iterable, Iterator
+
+from .log import Log
+
+
+class StringMatcher:
+    """Checks if a line contains any of the strings. Everything that doesn't depend on the line
+    (casefolding the strings, dropping ones that can't change the result) is done once, when it's made.
+
+    Each string is looked for with Python's own substring search. It runs in C, so it beats walking a
+    pattern automaton (Aho-Corasick) one character at a time in Python for any number of strings we'd type.
+
+    Parameters:
+    `strings` (Iterable[str]): strings to look for
+    `case_sensitive` (bool): toggles case sensitivity (False by default)
+
+    Examples:
+    `matcher = StringMatcher(["help", "maint"])`
+    `matcher("[12:00:00] SAY: ckey/(John) \"HELP\"")` # True
+    `matcher.filter(my_logs.logs)` # Logs that contain "help" or "maint"
+    `list(matcher.each(lines))` # [True, False, ...], one for each line
+    """
+    __slots__ = ('strings', 'case_sensitive')
+
+    strings: Annotated[tuple[str, ...], "Strings that are looked for, shortest first"]
+    case_sensitive: bool
+
+    def __init__(self, strings: Iterable[str], case_sensitive: bool = False) -> None:
+        self.case_sensitive = case_sensitive
+        if not case_sensitive:
+            strings = (string.casefold() for string in strings)
+        self.strings = StringMatcher.__without_redundant(strings)
+
+    @staticmethod
+    def __without_redundant(strings: Iterable[str]) -> tuple[str, ...]:
+        """Drops duplicates, and strings containing another string (if "help" is found, so is "help me").
+        Shorter strings are more likely to be found, so they're tried first"""
+        kept = []
+        for string in sorted(set(strings), key=len):
+            if not any(shorter in string for shorter in kept):
+                kept.append(string)
+        return tuple(kept)
+
+    def __call__(self, line: str) -> bool:
+        """Does the line contain any of the strings?"""
+        if not self.case_sensitive:
+            line = line.casefold()
+        for string in self.strings:
+            if string in line:
+                return True
+        return False
+
+    def each(self, lines: Iterable[str]) -> Iterator[bool]:
+        """Yields whether each line contains any of the strings. Same as calling it on every line, but with
+        one string (the usual) the whole loop runs in C"""
+        if not self.case_sensitive:
+            lines = map(str.casefold, lines)
+        strings = self.strings
+        if len(strings) == 1:
+            return map(contains, lines, repeat(strings[0]))
+
+        def contains_any(line: str) -> bool:
+            for string in strings:
+                if string in line:
+                    return True
+            return False
+        return map(contains_any, lines)
+
+    def filter(self, logs: Iterable[Log]) -> list[Log]:
+        """Returns the logs whose line contains any of the strings, in the same order"""
+        return [log for log in logs if self(log.raw_line)]
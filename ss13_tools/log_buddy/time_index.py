@@ -0,0 +1,53 @@
+"""Finds the logs from a stretch of time without looking at all of them"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Annotated
+
+from .log import Log
+from .log_index import LogIndex
+
+
+class TimeIndex(LogIndex):
+    """The time of every log in a list sorted by time, so the logs from any stretch of time
+    can be found with a binary search. Logs added to the end with `extend` must be from after the others.
+    See `LogIndex`
+
+    Parameters:
+    `logs` (list[Log]): logs to index, sorted by time
+
+    Examples:
+    `index = TimeIndex(my_logs.unfiltered_logs)`
+    `index.between(datetime(2023, 3, 1, 12), datetime(2023, 3, 1, 12, 2))` # Positions of logs in those 2 minutes
+    """
+    __slots__ = ('times',)
+
+    times: Annotated[list[datetime], "Time of each log, in the same order"]
+
+    def __init__(self, logs: list[Log], generation: int = 0) -> None:
+        super().__init__(logs, generation)
+        self.times = []
+        self.extend()
+
+    def _add(self, logs: list[Log], start: int) -> None:
+        self.times.extend([log.time for log in logs])
+
+    def between(self, start: datetime = None, end: datetime = None) -> range:
+        """Returns the positions of logs from `start` to `end`, both included. Leave one out to not limit it"""
+        first = bisect_left(self.times, start) if start is not None else 0
+        last = bisect_right(self.times, end) if end is not None else self.size
+        return range(first, max(first, last))
+
+    def insert(self, log: Log, generation: int) -> int:
+        """Puts the log in the list where its time goes (after logs from the same time), and in the index.
+        Logs after it move, so the list is at a new `generation` (the index is kept current). Returns its position"""
+        position = bisect_right(self.times, log.time)
+        self.logs.insert(position, log)
+        self.times.insert(position, log.time)
+        self.size += 1
+        self.generation = generation
+        return position
+
+    def around(self, time: datetime, seconds: float) -> range:
+        """Returns the positions of logs at most `seconds` before or after `time`"""
+        window = timedelta(seconds=seconds)
+        return self.between(time - window, time + window)
@@ -0,0 +1,95 @@
+"""Fast decoding of the timestamps tg puts in its logs"""
+from datetime import datetime, timedelta, timezone
+
+from dateutil.parser import isoparse
+
+
+EPOCH = datetime(1970, 1, 1)
+_ONE_MILLISECOND = timedelta(milliseconds=1)
+# "2023-03-01 12" (date and hour) is the part consecutive log lines almost always share
+_HOUR_PREFIX_LENGTH = 13
+
+
+def datetime_to_epoch_ms(time: datetime) -> int:
+    """Returns milliseconds since the Unix epoch. Naive datetimes (what tg logs use) are treated as UTC"""
+    if time.tzinfo:
+        time = time.astimezone(timezone.utc).replace(tzinfo=None)
+    return (time - EPOCH) // _ONE_MILLISECOND
+
+
+class TimestampDecoder:
+    """Decodes tg log timestamps, both the old `2023-03-01 12:34:56.789` format and
+    the JSON `2023-03-01T12:34:56.789` one. Anything else is handed to `dateutil.parser.isoparse`.
+
+    The date and hour of the last timestamp are remembered, so consecutive lines only decode
+    minutes, seconds and the fraction.
+
+    Examples:
+    `TimestampDecoder().decode("2023-03-01 12:34:56.789")`
+    `TimestampDecoder().decode_epoch_ms("2023-03-01T12:34:56.789")` (integer, handy for sorting)
+    """
+    __slots__ = ('_hour',)
+
+    _hour: tuple[str, tuple[int, int, int, int], int]
+
+    def __init__(self) -> None:
+        # (prefix, (year, month, day, hour), hour as epoch milliseconds), kept together so it's always consistent
+        self._hour = ("", (1970, 1, 1, 0), 0)
+
+    def decode(self, string: str) -> datetime:
+        """Decodes a timestamp into a datetime"""
+        parts = self.__decode_tail(string)
+        if not parts:
+            return isoparse(string)
+        hour, minute, second, microsecond = parts
+        return datetime(*hour[1], minute, second, microsecond)
+
+    def decode_epoch_ms(self, string: str) -> int:
+        """Decodes a timestamp into milliseconds since the Unix epoch (UTC)"""
+        parts = self.__decode_tail(string)
+        if not parts:
+            return datetime_to_epoch_ms(isoparse(string))
+        hour, minute, second, microsecond = parts
+        return hour[2] + minute * 60_000 + second * 1000 + microsecond // 1000
+
+    def __decode_tail(self, string: str):
+        """Returns the cached hour, minute, second and microsecond, or None if the format is not one we know"""
+        length = len(string)
+        if length < 19 or string[13] != ":" or string[16] != ":" or (length > 19 and string[19] != "."):
+            return None
+        hour = self._hour
+        if not hour[0] or not string.startswith(hour[0]):
+            hour = self.__decode_hour(string)
+            if not hour:
+                return None
+        fraction = string[20:]
+        try:
+            if length == 23:
+                # By far the most common, milliseconds
+                microsecond = int(fraction) * 1000
+            elif length == 19:
+                microsecond = 0
+            elif fraction.isdigit():
+                microsecond = int(fraction[:6].ljust(6, "0"))
+            else:
+                return None
+            return hour, int(string[14:16]), int(string[17:19]), microsecond
+        except ValueError:
+            return None
+
+    def __decode_hour(self, string: str):
+        """Decodes the date and hour part of the string and caches it"""
+        if string[4] != "-" or string[7] != "-" or string[10] not in " T":
+            return None
+        try:
+            time = datetime(int(string[:4]), int(string[5:7]), int(string[8:10]), int(string[11:13]))
+        except ValueError:
+            return None
+        self._hour = hour = (string[:_HOUR_PREFIX_LENGTH], (time.year, time.month, time.day, time.hour),
+                             datetime_to_epoch_ms(time))
+        return hour
+
+
+_default_decoder = TimestampDecoder()
+decode_timestamp = _default_decoder.decode
+decode_timestamp_epoch_ms = _default_decoder.decode_epoch_ms
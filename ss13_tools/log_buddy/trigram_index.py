@@ -0,0 +1,76 @@
+"""Finds the logs that might contain a string without looking at all of them"""
+from array import array
+from time import perf_counter
+from typing import Annotated, Iterable, Optional
+
+from .log import Log
+from .log_index import LogIndex
+
+# Strings shorter than this have no trigrams, so the index can't help with them
+TRIGRAM = 3
+
+
+class TrigramIndex(LogIndex):
+    """Which logs contain each sequence of three characters (trigram) of their casefolded `raw_line`.
+    A log can only contain a string if it contains all of its trigrams, so searching only has to check
+    the logs that do. Takes a while to build and a lot of memory, it's worth it when searching the same
+    logs over and over. Each trigram has an array of positions in the list, smallest first. See `LogIndex`
+
+    Parameters:
+    `logs` (list[Log]): logs to index
+
+    Examples:
+    `index = TrigramIndex(my_logs.unfiltered_logs)`
+    `index.candidates(["help maint"])` # Positions of logs that might contain "help maint"
+    """
+    __slots__ = ('postings', 'build_seconds')
+
+    postings: Annotated[dict[str, array], "Positions of logs by the trigrams in them"]
+    build_seconds: Annotated[float, "How long building the index took, in seconds"]
+
+    def __init__(self, logs: list[Log], generation: int = 0) -> None:
+        super().__init__(logs, generation)
+        self.postings = {}
+        self.build_seconds = 0
+        self.extend()
+
+    def _add(self, logs: list[Log], start: int) -> None:
+        began = perf_counter()
+        postings = self.postings
+        for position, log in enumerate(logs, start):
+            line = log.raw_line.casefold()
+            for trigram in {line[i:i + TRIGRAM] for i in range(len(line) - TRIGRAM + 1)}:
+                posting = postings.get(trigram)
+                if posting is None:
+                    posting = postings[trigram] = array('I')
+                posting.append(position)
+        self.build_seconds += perf_counter() - began
+
+    def candidates(self, strings: Iterable[str]) -> Optional[set[int]]:
+        """Returns the positions of logs that might contain any of the strings (case insensitive),
+        or None if the index can't tell because a string is too short"""
+        positions = set()
+        for string in strings:
+            string = string.casefold()
+            if len(string) < TRIGRAM:
+                return None
+            # Rarest first, so the set of candidates is small from the start
+            postings = sorted((self.postings.get(string[i:i + TRIGRAM], ()) for i in range(len(string) - TRIGRAM + 1)),
+                              key=len)
+            found = set(postings[0])
+            for posting in postings[1:]:
+                if not found:
+                    break
+                found.intersection_update(posting)
+            positions |= found
+        return positions
+
+    @property
+    def memory(self) -> int:
+        """About how many bytes the index takes up"""
+        return sum(posting.buffer_info()[1] * posting.itemsize for posting in self.postings.values())
+
+    def report(self) -> str:
+        """Returns how long building the index took, and how big it is"""
+        return f"Indexed {self.size} logs in {self.build_seconds:.2f}s: {len(self.postings)} trigrams, " \
+            f"{sum(map(len, self.postings.values()))} entries, {self.memory / 1024 ** 2:.1f} MiB"
@@ -0,0 +1,96 @@
+"""Remembers earlier work sets so filters can be undone and redone"""
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Annotated, Union
+
+from .log import Log
+from .working_set import WorkingSet
+from .constants import UNDO_MEMORY_LIMIT
+
+
+@dataclass
+class Snapshot:
+    """A work set from before (or after) a change. Only the bitmap is kept, the logs are shared"""
+    description: Annotated[str, "What the change was, like \"%search_ckey ckey1\""]
+    work_set: WorkingSet
+    generation: Annotated[int, "`LogFile.generation` of the logs when it was taken"]
+    size: Annotated[int, "How many logs there were when it was taken"] = field(init=False)
+    memory: Annotated[int, "Roughly how many bytes it takes"] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.size = len(self.work_set.logs)
+        self.memory = sys.getsizeof(self.work_set.bits)
+
+    def is_current(self, logs: list[Log], generation: int) -> bool:
+        """Can it still be restored? Not if logs were added, or if they moved (a new `generation`)"""
+        return self.work_set.logs is logs and self.generation == generation and self.size == len(logs)
+
+
+class UndoHistory:
+    """Work sets from before each change (to undo) and from before each undo (to redo). Undoing and redoing
+    only swaps which work set is used, no matter how many changes were made before.
+
+    Snapshots stop working when logs are added or sorted (their positions move), `undo` and `redo` return None then.
+
+    Parameters:
+    `memory_limit` (int): how many bytes the snapshots can take, the oldest are forgotten first
+
+    Examples:
+    `history.record("%ckey ckey1", my_logs.logs, my_logs.generation)` # Before filtering
+    `my_logs.logs = history.undo(my_logs.logs, my_logs.unfiltered_logs, my_logs.generation)`
+    """
+    __slots__ = ('memory_limit', 'undo_stack', 'redo_stack', 'memory')
+
+    memory_limit: Annotated[int, "How many bytes the snapshots can take"]
+    undo_stack: Annotated[deque[Snapshot], "Work sets from before each change, latest last"]
+    redo_stack: Annotated[list[Snapshot], "Work sets from before each undo, latest last"]
+    memory: Annotated[int, "Roughly how many bytes the snapshots take"]
+
+    def __init__(self, memory_limit: int = UNDO_MEMORY_LIMIT) -> None:
+        self.memory_limit = memory_limit
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.memory = 0
+
+    def record(self, description: str, before: WorkingSet, generation: int) -> None:
+        """Remembers the work set from before a change, and the `LogFile.generation` it's from.
+        Anything that was undone can't be redone after this"""
+        self.memory -= sum(snapshot.memory for snapshot in self.redo_stack)
+        self.redo_stack = []
+        self.__push(self.undo_stack, Snapshot(description, before, generation))
+        while self.memory > self.memory_limit and self.undo_stack:
+            self.memory -= self.undo_stack.popleft().memory
+
+    def undo(self, current: WorkingSet, logs: list[Log], generation: int, times: int = 1) -> Union[WorkingSet, None]:
+        """Returns the work set from before the last `times` changes, or None if the logs changed since then
+        (the history is cleared)"""
+        return self.__move(self.undo_stack, self.redo_stack, current, logs, generation, times)
+
+    def redo(self, current: WorkingSet, logs: list[Log], generation: int, times: int = 1) -> Union[WorkingSet, None]:
+        """Returns the work set from before the last `times` undos, or None if the logs changed since then
+        (the history is cleared)"""
+        return self.__move(self.redo_stack, self.undo_stack, current, logs, generation, times)
+
+    def clear(self) -> None:
+        """Forgets everything"""
+        self.undo_stack.clear()
+        self.redo_stack = []
+        self.memory = 0
+
+    def __move(self, source, target, current: WorkingSet, logs: list[Log], generation: int,
+               times: int) -> Union[WorkingSet, None]:
+        """Takes `times` snapshots from one stack, and puts the work sets they replace on the other"""
+        if not all(source[-i].is_current(logs, generation) for i in range(1, times + 1)):
+            self.clear()
+            return None
+        for _ in range(times):
+            snapshot = source.pop()
+            self.memory -= snapshot.memory
+            self.__push(target, Snapshot(snapshot.description, current, generation))
+            current = snapshot.work_set
+        return current
+
+    def __push(self, stack, snapshot: Snapshot) -> None:
+        stack.append(snapshot)
+        self.memory += snapshot.memory
@@ -0,0 +1,137 @@
+"""Keeps track of which logs are selected without making lists of them"""
+from __future__ import annotations
+
+from itertools import compress, islice
+from typing import Annotated, Iterable, Iterator, Union
+
+from .log import Log
+
+# Turns the digits of `bin()` into bytes that are 0 or 1, for `itertools.compress`
+_BITS_TO_BYTES = bytes.maketrans(b"01", b"\x00\x01")
+# int.bit_count is only in Python 3.10+
+_bit_count = int.bit_count if hasattr(int, "bit_count") else lambda bits: bin(bits).count("1")
+
+
+class WorkingSet:
+    """Some of the logs from a list (usually `LogFile.unfiltered_logs`), stored as a bitmap: bit `i` is set
+    if the log at position `i` is selected. Selections of the same list are combined with `&` (both),
+    `|` (either), `-` (the first but not the second) and `~` (everything else), without going through
+    the logs. Counting them only counts bits.
+
+    Reads like a list of the selected logs, in the order they're in the list.
+
+    Parameters:
+    `logs` (list[Log]): the logs that can be selected
+    `bits` (int): the bitmap, nothing is selected by default
+
+    Examples:
+    `everything = WorkingSet.all(my_logs.unfiltered_logs)`
+    `first_ten = WorkingSet.from_range(my_logs.unfiltered_logs, range(10))`
+    `len(everything - first_ten)`
+    """
+    __slots__ = ('logs', 'bits')
+
+    logs: Annotated[list[Log], "The logs that can be selected"]
+    bits: Annotated[int, "Bit `i` is set if the log at position `i` is selected"]
+
+    def __init__(self, logs: list[Log], bits: int = 0) -> None:
+        self.logs = logs
+        self.bits = bits
+
+    @staticmethod
+    def all(logs: list[Log]) -> WorkingSet:
+        """Returns a selection of all the logs"""
+        return WorkingSet(logs, (1 << len(logs)) - 1)
+
+    @staticmethod
+    def from_range(logs: list[Log], positions: range) -> WorkingSet:
+        """Returns a selection of the logs at a range of positions (without a step)"""
+        return WorkingSet(logs, ((1 << len(positions)) - 1) << positions.start if positions else 0)
+
+    @staticmethod
+    def from_positions(logs: list[Log], positions: Iterable[int]) -> WorkingSet:
+        """Returns a selection of the logs at these positions"""
+        bitmap = bytearray((len(logs) + 7) // 8)
+        for position in positions:
+            bitmap[position >> 3] |= 1 << (position & 7)
+        return WorkingSet(logs, int.from_bytes(bitmap, "little"))
+
+    def __selectors(self) -> bytes:
+        """One byte per position, 1 if it's selected, least significant bit first"""
+        return bin(self.bits)[:1:-1].encode().translate(_BITS_TO_BYTES) if self.bits else b""
+
+    def inserted(self, position: int, selected: bool = False) -> WorkingSet:
+        """Returns the same selection after a log was inserted into the list at `position`
+        (the ones after it move up by one). The new log is only selected if `selected` is set"""
+        below = self.bits & ((1 << position) - 1)
+        return WorkingSet(self.logs, below | (self.bits >> position << (position + 1)) | (int(selected) << position))
+
+    def positions(self) -> Iterator[int]:
+        """Yields the positions of the selected logs, smallest first"""
+        # compress goes through the bits in C
+        return compress(range(len(self.logs)), self.__selectors())
+
+    def reversed_positions(self) -> Iterator[int]:
+        """Yields the positions of the selected logs, largest first"""
+        # Finding the ones is done in C, so long runs of zeroes cost nothing
+        bits = bin(self.bits)[2:]
+        highest = len(bits) - 1
+        find = bits.find
+        index = find("1") if self.bits else -1
+        while index != -1:
+            yield highest - index
+            index = find("1", index + 1)
+
+    def items(self) -> Iterator[tuple[int, Log]]:
+        """Yields the position and the log of each selected log"""
+        return compress(enumerate(self.logs), self.__selectors())
+
+    def __iter__(self) -> Iterator[Log]:
+        return compress(self.logs, self.__selectors())
+
+    def __reversed__(self) -> Iterator[Log]:
+        return map(self.logs.__getitem__, self.reversed_positions())
+
+    def __len__(self) -> int:
+        return _bit_count(self.bits)
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Log, list[Log]]:
+        """Like a list. The first and last few logs (`[:10]`, `[-10:]`, `[0]`, `[-1]`) are found without
+        going through the rest"""
+        if isinstance(key, slice):
+            if key.step not in (None, 1):
+                return list(self)[key]
+            if not key.start and key.stop is not None and key.stop >= 0:
+                return list(islice(self, key.stop))
+            if key.start is not None and key.start < 0 and key.stop is None:
+                return list(islice(reversed(self), -key.start))[::-1]
+            return list(self)[key]
+        found = next(islice(self, key, None) if key >= 0 else islice(reversed(self), -key - 1, None), None)
+        if found is None:
+            raise IndexError("working set index out of range")
+        return found
+
+    def __check_same(self, other: WorkingSet) -> None:
+        if not isinstance(other, WorkingSet) or other.logs is not self.logs:
+            raise ValueError("Can only combine selections of the same logs")
+
+    def __and__(self, other: WorkingSet) -> WorkingSet:
+        self.__check_same(other)
+        return WorkingSet(self.logs, self.bits & other.bits)
+
+    def __or__(self, other: WorkingSet) -> WorkingSet:
+        self.__check_same(other)
+        return WorkingSet(self.logs, self.bits | other.bits)
+
+    def __sub__(self, other: WorkingSet) -> WorkingSet:
+        self.__check_same(other)
+        return WorkingSet(self.logs, self.bits & ~other.bits)
+
+    def __invert__(self) -> WorkingSet:
+        return WorkingSet(self.logs, ~self.bits & ((1 << len(self.logs)) - 1))
+
+    def __repr__(self) -> str:
+        return f"<WorkingSet of {len(self)} out of {len(self.logs)} logs>"
@@ -0,0 +1,28 @@
+import unittest
+
+from ss13_tools.log_buddy.ckey_index import CkeyIndex
+from ss13_tools.log_buddy.log import Log
+
+LINES = [
+    "[2023-03-01 12:00:00.000] ATTACK: someone/(Some One) has attacked Some Key/(Other Name) with the toolbox "
+    "(NEWHP: 50) (COMBAT MODE: 1) (DAMTYPE: BRUTE) (Bar (1,2,3))",
+    "[2023-03-01 12:00:01.000] SAY: someone/(Some One) \"hello\" (Bar (1,2,3))",
+]
+
+
+class CkeyIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = CkeyIndex([Log(line) for line in LINES])
+
+    def test_mentioned_key_with_spaces(self):
+        self.assertEqual(self.index.find("Some Key", agent=False, patient=False, mentioned=True), {0})
+        self.assertNotIn("key", self.index.mentioned)
+
+    def test_contains(self):
+        self.assertIn("Some Key", self.index)
+        self.assertIn("someone", self.index)
+        self.assertNotIn("key", self.index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from ss13_tools.log_buddy.follower import LogFollower
+from ss13_tools.log_buddy.log_parser import LogFile
+
+ANNOUNCEMENT = "[2023-03-01 12:00:00.000] SAY: admin/(Admin Person) (priority announcement) first line\n"
+NEXT_LOG = "[2023-03-01 12:00:01.000] SAY: someone/(Some One) \"hello\" (Bar (1,2,3))\n"
+
+
+class LogFollowerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.filename = os.path.join(self.folder.name, "game.log")
+        self.previous_folder = os.getcwd()
+        # Lines that can't be parsed go to errored.log in the working folder
+        os.chdir(self.folder.name)
+        self.write(ANNOUNCEMENT)
+        self.log_file = LogFile()
+        self.follower = LogFollower(self.log_file, self.filename, quiet=True)
+
+    def tearDown(self) -> None:
+        os.chdir(self.previous_folder)
+        self.folder.cleanup()
+
+    def write(self, text: str) -> None:
+        with open(self.filename, "a", encoding="utf-8") as file:
+            file.write(text)
+
+    def test_continuation_written_in_two_flushes(self):
+        self.follower.poll()
+        self.write("- second li")
+        self.follower.poll()
+        self.assertEqual(len(self.log_file.unfiltered_logs), 0)
+        self.write("ne\n")
+        self.follower.poll()
+        self.follower.poll()
+        self.assertEqual([log.raw_line for log in self.log_file.unfiltered_logs],
+                         [ANNOUNCEMENT.rstrip("\n") + "\\nsecond line"])
+        self.assertFalse(os.path.exists("errored.log"))
+
+    def test_next_log_releases_the_last_one(self):
+        self.follower.poll()
+        self.write(NEXT_LOG)
+        self.follower.poll()
+        self.assertEqual(len(self.log_file.unfiltered_logs), 1)
+        self.follower.poll()
+        self.assertEqual(len(self.log_file.unfiltered_logs), 2)
+
+    def test_smaller_file_drops_held_lines(self):
+        self.follower.poll()
+        with open(self.filename, "w", encoding="utf-8") as file:
+            file.write(NEXT_LOG[:10])
+        self.follower.poll()
+        self.assertEqual(len(self.log_file.unfiltered_logs), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()